@@ -6,12 +6,33 @@ Date: 2025
 """
 
 import argparse
+import base64
+import csv
+import gzip
+import hashlib
+import heapq
+import http.client
+import http.cookiejar
 import json
+import logging
+import math
+import multiprocessing
+import threading
 import time
 import os
+import queue
+import random
 import re
-from datetime import datetime
+import shutil
+import sqlite3
+import sys
+import urllib.request
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
 
 # Selenium imports
 from selenium import webdriver
@@ -27,12 +48,2002 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from bs4 import BeautifulSoup
 
 
+logger = logging.getLogger('review_scraper')
+
+# Messages starting with these marks are logged at a higher level than INFO
+LOG_LEVELS = (('❌', logging.ERROR), ('⚠️', logging.WARNING))
+
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line: time, level, message and the record's structured fields"""
+
+    def format(self, record):
+        entry = {'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+                 'level': record.levelname.lower(), 'message': record.getMessage().strip()}
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(log_format='text', level=logging.INFO):
+    """Send scraper logs to stdout as plain messages ('text') or JSON lines ('json')"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JSONLogFormatter() if log_format == 'json' else logging.Formatter('%(message)s'))
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def log(message, level=None, **fields):
+    """Log a progress message with optional structured fields; the level follows its leading mark unless given"""
+    if not logger.handlers:
+        configure_logging()
+    if level is None:
+        mark = message.lstrip()
+        level = next((lvl for prefix, lvl in LOG_LEVELS if mark.startswith(prefix)), logging.INFO)
+    logger.log(level, message, extra={'fields': fields})
+
+
+# URL patterns blocked in lean mode; '*' applies to every source
+LEAN_BLOCKLISTS = {
+    '*': [
+        '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*googleadservices.com*', '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*segment.com*',
+        '*segment.io*', '*optimizely.com*', '*bat.bing.com*', '*px.ads.linkedin.com*', '*snap.licdn.com*',
+        '*adroll.com*', '*quantserve.com*', '*cdn.cookielaw.org*', '*intercom.io*', '*driftt.com*',
+    ],
+    'g2': ['*youtube.com/embed*', '*vimeo.com*', '*js.hs-scripts.com*'],
+    'trustradius': ['*js.hs-scripts.com*', '*js.hs-analytics.net*', '*fullstory.com*'],
+    'capterra': ['*gartner.com/*analytics*'],
+}
+
+# Resource types blocked by URL extension (DevTools blocks by URL pattern, not by type)
+LEAN_RESOURCE_PATTERNS = {
+    'Image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'],
+    'Font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'Media': ['*.mp4', '*.webm', '*.mp3', '*.m3u8'],
+    'Stylesheet': ['*.css'],
+}
+
+# Rough transfer size per blocked request, used to estimate bytes avoided
+LEAN_AVERAGE_BYTES = {'Image': 30000, 'Font': 40000, 'Media': 250000, 'Stylesheet': 20000, 'Script': 35000}
+
+
+class LeanBrowser:
+    """Headless, eager-loading Chrome profile that blocks heavy resources through DevTools"""
+
+    def __init__(self, block_types=('Image', 'Font', 'Media')):
+        self.block_types = tuple(block_types)
+        self.totals = {'requests': 0, 'blocked': 0, 'bytes_loaded': 0, 'bytes_avoided_estimate': 0}
+        self.page = dict.fromkeys(self.totals, 0)
+
+    def configure(self, options):
+        """Add lean settings to ChromeOptions before the driver starts"""
+        options.add_argument('--headless=new')
+        options.page_load_strategy = 'eager'
+        if 'Image' in self.block_types:
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        # Network events are read back from the performance log to count what was blocked
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def patterns(self, source):
+        """Blocked URL patterns for a source"""
+        patterns = list(LEAN_BLOCKLISTS['*']) + list(LEAN_BLOCKLISTS.get(source, []))
+        for resource_type in self.block_types:
+            for pattern in LEAN_RESOURCE_PATTERNS.get(resource_type, []):
+                patterns += [pattern, pattern + '?*']
+        return patterns
+
+    def apply(self, driver, source):
+        """Install the source's blocklist in the running browser"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns(source)})
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+
+    @staticmethod
+    def network_events(driver):
+        """Drain the performance log into (method, params) DevTools events"""
+        try:
+            entries = driver.get_log('performance')
+        except WebDriverException:
+            return []
+        events = []
+        for entry in entries:
+            message = json.loads(entry['message']).get('message', {})
+            events.append((message.get('method'), message.get('params', {})))
+        return events
+
+    def observe(self, events):
+        """Count requests made, requests blocked and bytes loaded/avoided from network events"""
+        report = self.page
+        for method, params in events:
+            if method == 'Network.requestWillBeSent':
+                report['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                report['bytes_loaded'] += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                report['blocked'] += 1
+                report['bytes_avoided_estimate'] += LEAN_AVERAGE_BYTES.get(params.get('type'), 5000)
+
+    def page_report(self):
+        """Counters for the page just finished, folded into the run totals"""
+        report, self.page = self.page, dict.fromkeys(self.totals, 0)
+        for key, value in report.items():
+            self.totals[key] += value
+        return report
+
+
+# URL patterns of the JSON API calls that carry review data
+REVIEW_API_PATTERNS = {
+    # GraphQL endpoints also serve navigation, search and tracking; only review operations count
+    'g2': [r'g2\.com/.*reviews.*\.json', r'g2\.com/api/.*review', r'(?i)g2\.com/.*graphql.*review'],
+    'trustradius': [r'trustradius\.com/api/.*review', r'trustradius\.com/.*reviews.*\.json',
+                    r'(?i)trustradius\.com/.*graphql.*review'],
+    'capterra': [r'capterra\.com/.*api/.*review'],
+}
+
+# JSON keys that may hold each review field, in order of preference
+REVIEW_JSON_FIELDS = {
+    'title': ('title', 'headline', 'heading', 'review_title'),
+    'text': ('body', 'review_body', 'reviewBody', 'text', 'content', 'comment', 'love', 'pros'),
+    'date': ('submitted_at', 'published_at', 'publishedDate', 'datePublished', 'publishDate', 'created_at',
+             'date'),
+    'rating': ('star_rating', 'rating', 'ratingValue', 'overall_rating', 'score', 'stars'),
+    'reviewer': ('reviewer_name', 'author', 'reviewer', 'user', 'user_name', 'name'),
+    'job_title': ('job_title', 'jobTitle', 'reviewer_title', 'role', 'position'),
+    'company_size': ('company_size', 'companySize', 'segment', 'market_segment'),
+}
+
+
+def json_value(obj, keys):
+    """First non-empty value among keys; nested objects yield their name/value/text"""
+    for key in keys:
+        value = obj.get(key)
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('value') or value.get('text')
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def find_json_reviews(payload):
+    """Dicts anywhere in a JSON payload that look like reviews (a date plus a title or body)"""
+    found = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if (json_value(node, REVIEW_JSON_FIELDS['date']) is not None
+                    and (json_value(node, REVIEW_JSON_FIELDS['title']) is not None
+                         or json_value(node, REVIEW_JSON_FIELDS['text']) is not None)):
+                found.append(node)
+            else:
+                stack.extend(reversed(list(node.values())))
+    return found
+
+
+def json_review_fields(obj):
+    """Map a JSON review object onto the same field names the HTML extraction plans produce"""
+    fields = {}
+    for name, keys in REVIEW_JSON_FIELDS.items():
+        value = json_value(obj, keys)
+        fields[name] = None if value is None else re.sub(r'\s+', ' ', str(value)).strip()
+    day = to_date(fields['date'])
+    fields['date'] = str(day) if day else fields['date']
+    return fields
+
+
+class NetworkCapture:
+    """Collects review API responses seen in Chrome's DevTools network log"""
+
+    def __init__(self, patterns=REVIEW_API_PATTERNS):
+        self.patterns = {source: [re.compile(p) for p in items] for source, items in patterns.items()}
+        self.responses = {}   # requestId -> (source, url)
+        self.finished = set()
+        self.stats = {'responses': 0, 'reviews': 0, 'fallbacks': 0}
+
+    def source_of(self, url):
+        for source, patterns in self.patterns.items():
+            if any(p.search(url) for p in patterns):
+                return source
+        return None
+
+    def observe(self, events):
+        """Remember JSON responses from review APIs"""
+        for method, params in events:
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                source = self.source_of(response.get('url', ''))
+                if source and 'json' in (response.get('mimeType') or ''):
+                    self.responses[params['requestId']] = (source, response['url'])
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.responses:
+                self.finished.add(params['requestId'])
+
+    def reset(self):
+        """Forget responses of the page being left, so they are never taken for the next page's"""
+        self.responses.clear()
+        self.finished.clear()
+
+    def ready(self, source):
+        """Whether a finished review response for the source is waiting"""
+        return any(self.responses[r][0] == source for r in self.finished)
+
+    def take(self, driver, source):
+        """Fetch and decode the bodies of finished review responses for a source"""
+        payloads = []
+        for request_id in [r for r in self.finished if self.responses[r][0] == source]:
+            self.finished.discard(request_id)
+            _, url = self.responses.pop(request_id)
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                text = body['body']
+                if body.get('base64Encoded'):
+                    text = base64.b64decode(text).decode('utf-8')
+                payloads.append(json.loads(text))
+                self.stats['responses'] += 1
+            except (WebDriverException, ValueError) as e:
+                log(f"⚠️  Could not read captured response {url}: {e}")
+        return payloads
+
+
+class AdaptiveWait:
+    """Condition-based waits with timeouts tuned per source, domain and kind of wait from observed latencies"""
+
+    # Waits on the network (page loads, pagination, search); their timeout never drops below
+    # navigation_timeout, however fast the checks on content already in the DOM are
+    NAVIGATION_WAITS = frozenset({'previous page to unload', 'new reviews', 'review data', 'review list',
+                                  'prefetched page', 'search result', 'search box', 'autocomplete suggestion'})
+
+    # Installs a MutationObserver once per document and returns ms since the last DOM change
+    SETTLE_SCRIPT = """
+        if (!window.__rsObserver) {
+            window.__rsLastMutation = Date.now();
+            window.__rsObserver = new MutationObserver(function () { window.__rsLastMutation = Date.now(); });
+            window.__rsObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        }
+        return [document.readyState, Date.now() - window.__rsLastMutation];
+    """
+
+    def __init__(self, driver, default_timeout=15, min_timeout=2, max_timeout=30,
+                 factor=3.0, smoothing=0.3, poll=0.1, quiet_ms=400, navigation_timeout=15):
+        """Initialize with the driver and timeout tuning parameters"""
+        self.driver = driver
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.navigation_timeout = navigation_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.smoothing = smoothing
+        self.poll = poll
+        self.quiet_ms = quiet_ms
+        self.latency = {}      # (source, domain, label) -> smoothed latency in seconds
+        self.page_waits = []   # one entry per finished page
+        self._page = None
+        self.on_page_end = None  # optional callable returning extra per-page stats
+        self.metrics = None      # optional Metrics that every wait is reported to
+
+    def _domain(self):
+        """Domain of the page currently loaded in the driver"""
+        try:
+            return urlparse(self.driver.current_url).netloc
+        except WebDriverException:
+            return ""
+
+    def timeout_for(self, source, domain=None, label="condition"):
+        """Adaptive timeout for one kind of wait on a source/domain pair"""
+        key = (source, domain if domain is not None else self._domain(), label)
+        if key not in self.latency:
+            return self.default_timeout
+        floor = self.navigation_timeout if label in self.NAVIGATION_WAITS else self.min_timeout
+        return max(floor, min(self.max_timeout, self.latency[key] * self.factor))
+
+    def observe(self, source, domain, elapsed, label="condition"):
+        """Fold an observed latency into the smoothed estimate"""
+        key = (source, domain, label)
+        previous = self.latency.get(key)
+        if previous is None:
+            self.latency[key] = elapsed
+        else:
+            self.latency[key] = previous + self.smoothing * (elapsed - previous)
+
+    def until(self, source, condition, label="condition", patience=1):
+        """Wait for a condition using the adaptive timeout (times patience), recording the time spent"""
+        domain = self._domain()
+        timeout = self.timeout_for(source, domain, label) * patience
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            elapsed = time.monotonic() - started
+            # A timeout means our estimate was too low; grow it so the next attempt is more patient
+            self.observe(source, domain, elapsed, label)
+            self._record(elapsed)
+            raise TimeoutException(f"Timed out after {elapsed:.1f}s waiting for {label} on {domain or source}")
+        elapsed = time.monotonic() - started
+        self.observe(source, domain, elapsed, label)
+        self._record(elapsed)
+        return result
+
+    # Readiness conditions -------------------------------------------------
+
+    def dom_settled(self, driver):
+        """True once the document is loaded and no mutation happened for quiet_ms"""
+        try:
+            state, idle_ms = driver.execute_script(self.SETTLE_SCRIPT)
+        except WebDriverException:
+            return False
+        return state != "loading" and idle_ms >= self.quiet_ms
+
+    @staticmethod
+    def count_changed(selector, previous):
+        """Condition: number of elements matching selector is non-zero and differs from previous"""
+        def _check(driver):
+            count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+            return count if count and count != previous else False
+        return _check
+
+    def wait_settled(self, source):
+        """Wait until the DOM stops mutating; best effort, since callers have already seen their content"""
+        try:
+            return self.until(source, self.dom_settled, "DOM to settle")
+        except TimeoutException as e:
+            # Carousels, chat widgets and timers keep some pages mutating forever
+            log(f"🌀 {e.msg} - continuing with the content already present")
+            return False
+
+    def wait_for_page_change(self, source, old_node, selector, patience=1):
+        """Wait until the previous page's node is detached and the new page's reviews are present"""
+        if old_node is not None:
+            self.until(source, EC.staleness_of(old_node), "previous page to unload", patience)
+        self.until(source, self.count_changed(selector, 0), "new reviews", patience)
+        self.wait_settled(source)
+
+    # Per-page accounting --------------------------------------------------
+
+    def _record(self, elapsed):
+        """Add waited time to the page in progress"""
+        if self.metrics:
+            self.metrics.observe('wait', elapsed)
+        if self._page is not None:
+            self._page['wait_seconds'] += elapsed
+
+    def start_page(self, source, page):
+        """Begin accounting wait time for a page"""
+        self._page = {'source': source, 'page': page, 'wait_seconds': 0.0}
+
+    def end_page(self):
+        """Finish accounting for the current page and return its record"""
+        page, self._page = self._page, None
+        if page:
+            page['wait_seconds'] = round(page['wait_seconds'], 3)
+            if self.on_page_end:
+                page.update(self.on_page_end())
+            self.page_waits.append(page)
+            log(f"⏱️  Page {page['page']} waited {page['wait_seconds']:.2f}s")
+            if 'blocked' in page:
+                log(f"🪶 Page {page['page']}: {page['blocked']} of {page['requests']} requests blocked, "
+                    f"{page['bytes_loaded'] / 1024:.0f} KB loaded, ~{page['bytes_avoided_estimate'] / 1024:.0f} KB avoided")
+        return page
+
+    def summary(self):
+        """Aggregate wait statistics across finished pages"""
+        total = sum(p['wait_seconds'] for p in self.page_waits)
+        return {
+            'pages': len(self.page_waits),
+            'total_wait_seconds': round(total, 3),
+            'avg_wait_seconds': round(total / len(self.page_waits), 3) if self.page_waits else 0.0,
+            'timeouts': {f"{s}@{d}: {label}": round(self.timeout_for(s, d, label), 2)
+                         for s, d, label in self.latency},
+        }
+
+
+class Metrics:
+    """
+    Stage timings of a scraper: trace spans, per-page breakdowns and per-run histograms.
+
+    Stages are timed with `with metrics.stage(name):`. Results export as a Chrome trace-event JSON
+    file (chrome://tracing, Perfetto) and as Prometheus text, served on /metrics or written to a file.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, max_spans=100000):
+        self.max_spans = max_spans
+        self.server = None
+        self.reset()
+
+    def reset(self):
+        """Drop everything recorded so far (e.g. between batch jobs)"""
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.durations = {}   # stage -> list of seconds
+        self.counters = {}
+        self.pages = []
+        self._page = None
+
+    def export(self, trace_path=None, prometheus_path=None):
+        """Write the trace and/or Prometheus files that were asked for"""
+        if trace_path:
+            log(f"🧭 Trace written to {self.write_trace(trace_path)}")
+        if prometheus_path:
+            log(f"📈 Metrics written to {self.write_prometheus(prometheus_path)}")
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one span of stage name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, started)
+
+    def observe(self, name, seconds, started=None):
+        """Record one span of a stage"""
+        started = time.perf_counter() - seconds if started is None else started
+        self.durations.setdefault(name, []).append(seconds)
+        if self._page is not None:
+            self._page['stages'][name] = self._page['stages'].get(name, 0.0) + seconds
+        if len(self.spans) < self.max_spans:
+            page = self._page
+            self.spans.append((name, started - self.origin, seconds, page['source'] if page else None,
+                               page['page'] if page else None))
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def start_page(self, source, page):
+        """Attribute the following spans to a page (finishing the previous one)"""
+        self.finish_page()
+        self._page = {'source': source, 'page': page, 'started': time.perf_counter(), 'stages': {}}
+        self.count('pages')
+
+    def finish_page(self):
+        """Close the page in progress, recording its wall time"""
+        page, self._page = self._page, None
+        if page:
+            seconds = time.perf_counter() - page.pop('started')
+            self.durations.setdefault('page', []).append(seconds)
+            self.pages.append({'source': page['source'], 'page': page['page'], 'seconds': round(seconds, 4),
+                               'stages': {k: round(v, 4) for k, v in page['stages'].items()}})
+
+    def summary(self):
+        """Per-stage count, total, p50, p95 and max seconds"""
+        stats = {}
+        for name, values in self.durations.items():
+            ordered = sorted(values)
+            stats[name] = {'count': len(ordered), 'total': round(sum(ordered), 4),
+                           'p50': round(ordered[len(ordered) // 2], 4),
+                           'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                           'max': round(ordered[-1], 4)}
+        return stats
+
+    def report(self, top=5):
+        """Log where the time went, largest stage first"""
+        stages = {k: v for k, v in self.summary().items() if k != 'page'}
+        total = sum(s['total'] for s in stages.values())
+        if not total:
+            return
+        ranked = sorted(stages.items(), key=lambda item: item[1]['total'], reverse=True)[:top]
+        shares = ", ".join(f"{name} {s['total']:.1f}s ({s['total'] / total:.0%})" for name, s in ranked)
+        log(f"📊 Stage time: {shares}", stages=stages)
+
+    def write_trace(self, path):
+        """Write spans, pages and stage statistics as a Chrome trace-event JSON file"""
+        events = [{'name': name, 'cat': source or 'run', 'ph': 'X', 'ts': round(start * 1e6),
+                   'dur': round(seconds * 1e6), 'pid': os.getpid(), 'tid': 0, 'args': {'page': page}}
+                  for name, start, seconds, source, page in self.spans]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'pages': self.pages, 'stages': self.summary(),
+                       'counters': self.counters}, f, indent=1)
+        return path
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = ['# HELP review_scraper_stage_seconds Time spent per scraper stage',
+                 '# TYPE review_scraper_stage_seconds histogram']
+        for name, values in sorted(self.durations.items()):
+            for bound in self.BUCKETS:
+                count = sum(1 for v in values if v <= bound)
+                lines.append(f'review_scraper_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'review_scraper_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {len(values)}')
+            lines.append(f'review_scraper_stage_seconds_sum{{stage="{name}"}} {sum(values):.6f}')
+            lines.append(f'review_scraper_stage_seconds_count{{stage="{name}"}} {len(values)}')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'# TYPE review_scraper_{name}_total counter')
+            lines.append(f'review_scraper_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text to a file (e.g. for node_exporter's textfile collector)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(self.prometheus(), encoding='utf-8')
+        return path
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serve the Prometheus text on http://host:port/metrics from a background thread"""
+        self.server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self.server.metrics = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        log(f"📈 Metrics on http://{host}:{self.server.server_address[1]}/metrics")
+        return self.server
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """GET /metrics returns the scraper's Prometheus text"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SourcePlugin:
+    """
+    Declarative description of a review site, run by ReviewScraper.scrape_source.
+
+    search: strategies tried in order, either ('results', search URL with {query}, product link
+        selector) or ('autocomplete', page URL, search box selector, suggestion selector) (browser only).
+    pagination: 'numbered' when ?page=N addresses listing pages, which enables the date-window
+        search; 'click' when pages are only reached through the Next link.
+    container, fields and next_link make up the extraction plan. Each field maps to
+        (selector, attribute or None for its text, index of the match). ready is what the browser
+        waits for before parsing (default: the container).
+    date_formats: strptime formats of the date field. require_date drops reviews without a
+        parseable date; require_content drops those without a title and a body or rating.
+    """
+
+    def __init__(self, name, label, domain, search, container, fields, next_link, date_formats,
+                 pagination='numbered', ready=None, backends=('selenium',), require_date=False,
+                 require_content=False):
+        self.name = name
+        self.label = label
+        self.domain = domain
+        self.search = search
+        self.container = container
+        self.fields = fields
+        self.next_link = next_link
+        self.date_formats = date_formats
+        self.pagination = pagination
+        self.ready = ready or container
+        self.backends = backends
+        self.require_date = require_date
+        self.require_content = require_content
+
+    def extraction_plan(self):
+        return {'container': self.container, 'fields': self.fields, 'next_link': self.next_link}
+
+
+# Every supported review site. Sources listed with the 'http' backend serve their
+# reviews in server-rendered HTML and do not need a browser.
+SOURCE_PLUGINS = {plugin.name: plugin for plugin in (
+    SourcePlugin(
+        'g2', 'G2', 'g2.com',
+        search=[('results', "https://www.g2.com/search?query={query}", "a[href*='/products/'][href*='/reviews']")],
+        container='div[data-poison]',
+        fields={
+            'reviewer': ('div[itemprop="author"] meta[itemprop="name"]', 'content', 0),
+            'job_title': ('div.elv-text-xs.elv-font-regular', None, 0),
+            'company_size': ('div.elv-text-xs.elv-font-regular', None, 2),
+            'date': ('meta[itemprop="datePublished"]', 'content', 0),
+            'rating': ('span[itemprop="reviewRating"] meta[itemprop="ratingValue"]', 'content', 0),
+            'title': ('div[itemprop="name"]', None, 0),
+            'text': ('div[itemprop="reviewBody"]', None, 0),
+        },
+        next_link=('ul.pagination a', 'Next'),
+        date_formats=('%Y-%m-%d',),
+        ready="div.elv-flex.elv-flex-col.elv-gap-2.md\\:elv-gap-6",
+        backends=('selenium', 'http'),
+        require_date=True,
+        require_content=True,
+    ),
+    SourcePlugin(
+        'capterra', 'Capterra', 'capterra.com',
+        search=[('results', "https://www.capterra.com/search?query={query}", "a[href*='/p/'][href*='/reviews/']")],
+        container="div[data-test-id='review-card']",
+        fields={
+            'reviewer': ("span[data-test-id='reviewer-full-name']", None, 0),
+            'job_title': ("span[data-test-id='reviewer-job-title']", None, 0),
+            'company_size': ("span[data-test-id='reviewer-company-size']", None, 0),
+            'date': ("span[data-test-id='review-written-on']", None, 0),
+            'rating': ("meta[itemprop='ratingValue']", 'content', 0),
+            'title': ("h3[data-test-id='review-title']", None, 0),
+            'text': ("p[data-test-id='review-body']", None, 0),
+        },
+        next_link=("a[aria-label='Next']", None),
+        date_formats=('%B %d, %Y', '%b %d, %Y', '%Y-%m-%d'),
+        require_content=True,
+    ),
+    SourcePlugin(
+        'trustradius', 'TrustRadius', 'trustradius.com',
+        search=[('results', "https://www.trustradius.com/search?query={query}",
+                 "a[href*='/products/'][href*='/reviews']"),
+                ('autocomplete', "https://www.trustradius.com/", "input[placeholder*='Search']",
+                 "ul.autocomplete__list li a")],
+        container='div.reviewCard',
+        fields={
+            'reviewer': ('span.reviewCard__reviewerName', None, 0),
+            'job_title': ('span.reviewCard__reviewerRole', None, 0),
+            'date': ('span.reviewCard__reviewDate', None, 0),
+            'rating': ("meta[itemprop='ratingValue']", 'content', 0),
+            'title': ('h3.reviewCard__title', None, 0),
+            'text': ('div.reviewCard__body', None, 0),
+        },
+        next_link=("a[aria-label='Next Page']", None),
+        date_formats=('%B %d, %Y', '%b %d, %Y', '%Y-%m-%d'),
+        pagination='click',
+    ),
+)}
+
+# Fetch backends each source can use
+SOURCE_BACKENDS = {name: plugin.backends for name, plugin in SOURCE_PLUGINS.items()}
+
+SOURCE_DOMAINS = {name: plugin.domain for name, plugin in SOURCE_PLUGINS.items()}
+
+
+def fixture_name(url):
+    """File name a recorded page is stored under, derived from its path and query"""
+    parts = urlparse(url)
+    key = parts.path + (f"?{parts.query}" if parts.query else "")
+    return (re.sub(r'[^\w.-]+', '_', key).strip('_') or 'index') + '.html'
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of fetching while a domain's circuit breaker is open"""
+
+
+class SearchTimeoutError(TimeoutError):
+    """A search page did not load (or showed a challenge), so 'not found' cannot be told apart; never cached"""
+
+
+class HTTPStatusError(ConnectionError):
+    """HTTP error response, with its status code"""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+
+
+# Titles of bot challenges and block pages served instead of the requested page
+CHALLENGE_TITLE = re.compile(r'just a moment|attention required|access denied|are you a robot|'
+                             r'verify you are (a )?human|captcha|too many requests', re.I)
+
+
+def is_challenge(html):
+    """Whether an HTML document is a bot challenge or block page"""
+    match = re.search(r'<title[^>]*>([^<]*)', html[:20000], re.I)
+    return bool(match and CHALLENGE_TITLE.search(match.group(1)))
+
+
+class RateLimiter:
+    """
+    Per-domain token buckets whose rate adapts to how each site responds.
+
+    Healthy responses raise a domain's rate by a fixed step; slow, throttled or blocked ones halve it.
+    After failure_threshold failures in a row the domain's circuit opens and requests to it are
+    refused until cooldown seconds have passed.
+    """
+
+    RETRY_STATUSES = (403, 408, 425, 429, 500, 502, 503, 504)
+
+    def __init__(self, rate=1.0, min_rate=0.05, max_rate=8.0, burst=2, step=0.2, slow_seconds=8.0,
+                 max_retries=4, backoff=2.0, max_backoff=120.0, failure_threshold=5, cooldown=300.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.step = step
+        self.slow_seconds = slow_seconds
+        self.max_retries = max_retries
+        self.backoff_base = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.domains = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def domain(url):
+        netloc = urlparse(url).netloc.lower()
+        return netloc[4:] if netloc.startswith('www.') else netloc
+
+    def _state(self, url):
+        domain = self.domain(url)
+        if domain not in self.domains:
+            self.domains[domain] = {'rate': self.rate, 'tokens': float(self.burst), 'updated': time.monotonic(),
+                                    'failures': 0, 'open_until': 0.0, 'requests': 0, 'waited': 0.0,
+                                    'throttled': 0, 'slow': 0, 'circuit_opened': 0}
+        return domain, self.domains[domain]
+
+    def acquire(self, url):
+        """Wait for the domain's next token; raises CircuitOpenError while its circuit is open"""
+        with self._lock:
+            domain, state = self._state(url)
+            now = time.monotonic()
+            if state['open_until'] > now:
+                raise CircuitOpenError(f"Circuit open for {domain}: retry in {state['open_until'] - now:.0f}s")
+            state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * state['rate'])
+            state['updated'] = now
+            # Taking the token now (even into debt) keeps concurrent callers queued in order
+            state['tokens'] -= 1
+            delay = -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+            state['requests'] += 1
+            state['waited'] += delay
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def success(self, url, elapsed=0.0):
+        """Record a good response: speed up, unless it was slow"""
+        with self._lock:
+            _, state = self._state(url)
+            state['failures'] = 0
+            if elapsed > self.slow_seconds:
+                state['slow'] += 1
+                state['rate'] = max(self.min_rate, state['rate'] / 2)
+            else:
+                state['rate'] = min(self.max_rate, state['rate'] + self.step)
+
+    def backoff(self, url, attempt):
+        """Record a throttled, blocked or failed response; seconds to wait before retry attempt+1, or None to give up"""
+        with self._lock:
+            domain, state = self._state(url)
+            state['throttled'] += 1
+            state['failures'] += 1
+            state['rate'] = max(self.min_rate, state['rate'] / 2)
+            if state['failures'] >= self.failure_threshold:
+                state['failures'] = 0
+                state['circuit_opened'] += 1
+                state['open_until'] = time.monotonic() + self.cooldown
+                log(f"🔌 {domain} keeps failing - circuit open for {self.cooldown:.0f}s")
+                return None
+        if attempt + 1 >= self.max_retries:
+            return None
+        return min(self.max_backoff, self.backoff_base ** (attempt + 1) * random.uniform(0.5, 1.5))
+
+    def report(self):
+        """Per-domain rate and counters"""
+        return {domain: {'rate': round(s['rate'], 2), 'requests': s['requests'], 'waited': round(s['waited'], 1),
+                         'throttled': s['throttled'], 'slow': s['slow'], 'circuit_opened': s['circuit_opened']}
+                for domain, s in self.domains.items()}
+
+
+class SeleniumFetcher:
+    """Fetch backend that loads pages in the scraper's Chrome session"""
+    name = 'selenium'
+
+    def __init__(self, scraper, source=None):
+        self.scraper = scraper
+        self.source = source
+
+    def fetch(self, url):
+        """Navigate to url and return the rendered HTML"""
+        self.scraper.navigate(url)
+        return self.page_source()
+
+    def page_source(self):
+        """HTML of the page currently loaded in the browser (only its reviews in scoped mode)"""
+        scoped = self.scraper.scoped
+        with self.scraper.metrics.stage('page_source'):
+            if scoped and scoped.covers(self.source):
+                html = scoped.capture(self.scraper.driver, self.source)
+            else:
+                html = self.scraper.driver.page_source
+        self.scraper.metrics.count('bytes_received', len(html.encode('utf-8')))
+        if self.scraper.page_cache:
+            self.scraper.page_cache.put(self.scraper.driver.current_url, html)
+        return html
+
+    def close(self):
+        pass
+
+
+class TabPrefetcher:
+    """Keeps the next few numbered pages loading in extra tabs of the scraper's Chrome session"""
+
+    def __init__(self, fetcher, depth=3, on_new_tab=None):
+        self.fetcher = fetcher
+        self.driver = fetcher.scraper.driver
+        self.depth = depth
+        self.on_new_tab = on_new_tab
+        self.main = self.driver.current_window_handle
+        self.tabs = {}  # page number -> window handle
+        self.stats = {'opened': 0, 'used': 0, 'discarded': 0}
+
+    def fill(self, url_for, page):
+        """Start loading pages page .. page + depth - 1 that are not already in flight"""
+        for number in range(page, page + self.depth):
+            if number in self.tabs:
+                continue
+            if self.fetcher.scraper.limiter:
+                self.fetcher.scraper.limiter.acquire(url_for(number))
+            self.driver.switch_to.new_window('tab')
+            if self.on_new_tab:
+                self.on_new_tab()
+            # Assigning location returns immediately, unlike driver.get, so the tabs load side by side
+            self.driver.execute_script("window.location.href = arguments[0];", url_for(number))
+            self.tabs[number] = self.driver.current_window_handle
+            self.stats['opened'] += 1
+        self.driver.switch_to.window(self.main)
+
+    def take(self, page, wait):
+        """Switch to the tab holding page, wait() until it has loaded, and return its HTML; the tab is closed"""
+        self.driver.switch_to.window(self.tabs.pop(page))
+        try:
+            wait()
+            self.stats['used'] += 1
+            return self.fetcher.page_source()
+        finally:
+            self.driver.close()
+            self.driver.switch_to.window(self.main)
+
+    def close(self):
+        """Close tabs still in flight"""
+        for handle in self.tabs.values():
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+            self.stats['discarded'] += 1
+        self.tabs = {}
+        self.driver.switch_to.window(self.main)
+
+
+class HTTPFetcher:
+    """Fetch backend over plain HTTP with pooled keep-alive connections, compression and cookies"""
+    name = 'http'
+    HEADERS = {
+        'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                       '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    }
+    REDIRECTS = (301, 302, 303, 307, 308)
+
+    def __init__(self, pool_size=4, timeout=20, origin=None, record_dir=None, max_redirects=5, cache=None,
+                 limiter=None):
+        """
+        origin: send every request to this scheme://host instead (e.g. a local FixtureServer)
+        record_dir: save every fetched page here so it can be served back later
+        cache: PageCache that every fetched page is added to
+        limiter: RateLimiter that paces and retries every request
+        """
+        self.cache = cache
+        self.limiter = limiter
+        self.metrics = None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.origin = urlparse(origin) if origin else None
+        self.record_dir = record_dir
+        self.max_redirects = max_redirects
+        self.cookies = http.cookiejar.CookieJar()
+        self.stats = {'requests': 0, 'connections': 0, 'bytes_received': 0, 'bytes_decoded': 0}
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, netloc):
+        """Open a new connection and count it"""
+        self.stats['connections'] += 1
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """Reuse an idle keep-alive connection for (scheme, netloc) or open a new one"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return self._connect(*key)
+
+    def _release(self, key, connection):
+        """Return a connection to the pool, closing it if the pool is full"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _request(self, url):
+        """Send one GET for url and return (response, body)"""
+        started = time.perf_counter()
+        parts = urlparse(url)
+        scheme, netloc = (self.origin.scheme, self.origin.netloc) if self.origin else (parts.scheme, parts.netloc)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        # Cookies are keyed on the real URL so they behave the same against a stand-in server
+        request = urllib.request.Request(url, headers=self.HEADERS)
+        self.cookies.add_cookie_header(request)
+        headers = dict(request.header_items())
+
+        key = (scheme, netloc)
+        connection = self._acquire(key)
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Idle keep-alive connections may have been dropped by the server; retry once on a fresh one
+            connection.close()
+            connection = self._connect(*key)
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+        body = response.read()
+
+        self.cookies.extract_cookies(response, request)
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        self.stats['requests'] += 1
+        self.stats['bytes_received'] += len(body)
+        if self.metrics:
+            self.metrics.observe('fetch', time.perf_counter() - started)
+            self.metrics.count('bytes_received', len(body))
+        return response, body
+
+    def fetch(self, url):
+        """GET url, paced and retried through the rate limiter if there is one, and return the decoded HTML"""
+        if not self.limiter:
+            return self._fetch(url)
+        attempt = 0
+        while True:
+            paced = self.limiter.acquire(url)
+            if paced and self.metrics:
+                self.metrics.observe('rate_limit', paced)
+            started = time.monotonic()
+            try:
+                html = self._fetch(url)
+                if is_challenge(html):
+                    raise HTTPStatusError(429, url)
+            except (HTTPStatusError, OSError, http.client.HTTPException) as e:
+                if isinstance(e, HTTPStatusError) and e.status not in RateLimiter.RETRY_STATUSES:
+                    raise
+                delay = self.limiter.backoff(url, attempt)
+                if delay is None:
+                    raise
+                log(f"🐢 {e} - retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.success(url, time.monotonic() - started)
+            return html
+
+    def _fetch(self, url):
+        """GET url following redirects and return the decoded HTML"""
+        for _ in range(self.max_redirects + 1):
+            response, body = self._request(url)
+            location = response.getheader('Location')
+            if response.status in self.REDIRECTS and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPStatusError(response.status, url)
+
+            encoding = (response.getheader('Content-Encoding') or '').lower()
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                body = zlib.decompress(body)
+            self.stats['bytes_decoded'] += len(body)
+
+            charset = response.msg.get_content_charset() or 'utf-8'
+            html = body.decode(charset, errors='replace')
+            if self.record_dir:
+                Path(self.record_dir).mkdir(parents=True, exist_ok=True)
+                Path(self.record_dir, fixture_name(url)).write_text(html, encoding='utf-8')
+            if self.cache:
+                self.cache.put(url, html)
+            return html
+
+        raise ConnectionError(f"Too many redirects for {url}")
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class PageCache:
+    """Compressed, content-addressed on-disk cache of fetched pages, indexed by URL and fetch time"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blobs (
+            digest TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fetches (
+            url TEXT NOT NULL,
+            domain TEXT NOT NULL,
+            fetched_at TEXT NOT NULL,
+            digest TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS fetches_by_domain ON fetches (domain, fetched_at);
+        CREATE INDEX IF NOT EXISTS fetches_by_digest ON fetches (digest);
+    """
+
+    def __init__(self, directory="output/page_cache", max_bytes=1024 * 1024 * 1024):
+        """Open (or create) the cache in directory, keeping at most max_bytes of compressed pages"""
+        self.directory = Path(directory)
+        (self.directory / 'objects').mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.directory / 'index.db'), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def _path(self, digest):
+        return self.directory / 'objects' / digest[:2] / f"{digest}.html.gz"
+
+    def put(self, url, html):
+        """Add a fetched page; identical content is stored once. Returns its digest"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=6)
+            temp = path.with_suffix('.tmp')
+            temp.write_bytes(compressed)
+            os.replace(temp, path)
+            size = len(compressed)
+        else:
+            size = path.stat().st_size
+
+        now = time.time()
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", (digest, size, now))
+            self.conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (now, digest))
+            self.conn.execute("INSERT INTO fetches VALUES (?, ?, ?, ?)",
+                              (url, urlparse(url).netloc, datetime.now().isoformat(timespec='seconds'), digest))
+        self.evict()
+        return digest
+
+    def get(self, digest):
+        """HTML for a digest, or None if it was evicted"""
+        try:
+            data = gzip.decompress(self._path(digest).read_bytes())
+        except FileNotFoundError:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        return data.decode('utf-8')
+
+    def latest(self, url):
+        """Most recently fetched HTML for a URL, or None"""
+        row = self.conn.execute("SELECT digest FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                                (url,)).fetchone()
+        return self.get(row[0]) if row else None
+
+    def pages(self, domain=None, url_contains=None):
+        """(url, fetched_at, digest) for each distinct cached page, newest fetch first"""
+        query = "SELECT url, MAX(fetched_at), digest FROM fetches WHERE 1 = 1"
+        params = []
+        if domain:
+            query += " AND domain LIKE ?"
+            params.append(f"%{domain}")
+        if url_contains:
+            query += " AND url LIKE ?"
+            params.append(f"%{url_contains}%")
+        query += " GROUP BY digest ORDER BY MAX(fetched_at) DESC"
+        return self.conn.execute(query, params).fetchall()
+
+    def evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for digest, size in self.conn.execute("SELECT digest, size FROM blobs ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            victims.append(digest)
+            total -= size
+        with self.conn:
+            for digest in victims:
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                self.conn.execute("DELETE FROM fetches WHERE digest = ?", (digest,))
+                self._path(digest).unlink(missing_ok=True)
+
+    def close(self):
+        self.conn.close()
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serve recorded pages by fixture_name(), gzip-compressed when the client accepts it, and redirects"""
+    protocol_version = 'HTTP/1.1'
+    # Keep-alive responses would otherwise stall ~40 ms each on Nagle's algorithm and delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        location = self.server.redirects.get(self.path)
+        if location:
+            self.send_response(301)
+            self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        path = Path(self.server.directory, fixture_name(self.path))
+        if not path.is_file():
+            self.send_error(404)
+            return
+
+        body = path.read_bytes()
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        if 'Cookie' not in self.headers:
+            self.send_header('Set-Cookie', 'session=fixture; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Local stand-in HTTP server serving recorded pages from a directory"""
+
+    def __init__(self, directory, host='127.0.0.1', port=0, latency=0.0, redirects=None):
+        """redirects: request path -> Location answered with a 301 instead of a page"""
+        self.httpd = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+        self.httpd.directory = directory
+        self.httpd.latency = latency
+        self.httpd.redirects = redirects or {}
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class DateNormalizer:
+    """
+    Date parsing shared by every source, the date window, filtering and sorting.
+
+    Each distinct (source, string) pair is parsed once and cached. The format that last matched
+    for a source is tried first, so a site's steady format costs a single parse; ISO dates go
+    through date.fromisoformat. Results are always date objects, or None when nothing matches.
+    """
+
+    ISO = '%Y-%m-%d'
+
+    def __init__(self, max_entries=65536):
+        self.max_entries = max_entries
+        self.cache = {}
+        self.formats = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, value, source=None):
+        """Date of a string in the source's declared formats (YYYY-MM-DD without a source), or None"""
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        key = (source, value)
+        day = self.cache.get(key, key)
+        if day is not key:
+            self.hits += 1
+            return day
+        self.misses += 1
+        day = self._parse(str(value).strip(), source)
+        if len(self.cache) >= self.max_entries:
+            self.cache.clear()
+        self.cache[key] = day
+        return day
+
+    def _parse(self, text, source):
+        formats = SOURCE_PLUGINS[source].date_formats if source else (self.ISO,)
+        last = self.formats.get(source)
+        if last and formats[0] != last:
+            formats = (last,) + tuple(fmt for fmt in formats if fmt != last)
+        for fmt in formats:
+            try:
+                day = self._strptime(text, fmt)
+            except ValueError:
+                continue
+            self.formats[source] = fmt
+            return day
+        return None
+
+    def _strptime(self, text, fmt):
+        if fmt != self.ISO:
+            return datetime.strptime(text, fmt).date()
+        # ISO dates may carry a time part; strptime still accepts unpadded months and days
+        try:
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            return datetime.strptime(text[:10], fmt).date()
+
+    def parse_many(self, values, source=None):
+        """Dates for a whole page of date strings, parsing each distinct string once"""
+        days = {value: self.parse(value, source) for value in set(values)}
+        return [days[value] for value in values]
+
+    def window(self, start, end):
+        """(start, end) dates of a YYYY-MM-DD date window; ValueError unless both are exactly that format"""
+        days = []
+        for value in (start, end):
+            if isinstance(value, date):
+                days.append(self.parse(value))
+                continue
+            # Unlike review dates, user input is never truncated: it also names output files
+            try:
+                days.append(datetime.strptime(str(value), self.ISO).date())
+            except ValueError:
+                raise ValueError(f"Dates must be in YYYY-MM-DD format, got '{start}' and '{end}'") from None
+        return tuple(days)
+
+    def report(self):
+        """Cache size, hit/miss counts and the format detected for each source"""
+        return {
+            'cached': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'formats': {source or 'iso': fmt for source, fmt in self.formats.items()},
+        }
+
+
+DATES = DateNormalizer()
+
+
+def to_date(value):
+    """Coerce a date or 'YYYY-MM-DD' string to a date, or None if it cannot be parsed"""
+    return DATES.parse(value)
+
+
+def page_url(url, page):
+    """URL of a numbered page of a review listing (?page=N)"""
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != 'page']
+    if page > 1:
+        query.append(('page', str(page)))
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+# Dates and ratings repeat across reviews; every review refers to one shared object per value
+SHARED_VALUES = {}
+
+
+def shared_value(value):
+    """The shared instance of an immutable value"""
+    return SHARED_VALUES.setdefault(value, value)
+
+
+def intern_text(value):
+    """Interned string for a categorical field (source, job title, company size, date text)"""
+    return sys.intern(str(value)) if value else ''
+
+
+def to_rating(value):
+    """Rating as a shared float, or None if missing or not numeric"""
+    try:
+        return shared_value(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class Review:
+    """Compact review record: slotted, with interned categorical fields, a float rating and a date"""
+
+    __slots__ = ('title', 'description', 'date', 'parsed_date', 'rating', 'reviewer', 'job_title',
+                 'company_size', 'source')
+    FIELDS = __slots__
+
+    def __init__(self, title='No title', description='', date=None, parsed_date=None, rating=None,
+                 reviewer='Anonymous', job_title='', company_size='', source=''):
+        day = to_date(parsed_date) or to_date(date)
+        self.title = title
+        self.description = description
+        self.date = intern_text(date) if date else None
+        self.parsed_date = shared_value(day) if day else None
+        self.rating = to_rating(rating)
+        self.reviewer = reviewer
+        self.job_title = intern_text(job_title)
+        self.company_size = intern_text(company_size)
+        self.source = intern_text(source)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Review from an exported dict (store rows, NDJSON lines)"""
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    def get(self, field, default=None):
+        """Exported value of a field, like dict.get"""
+        if field not in self.FIELDS:
+            return default
+        value = getattr(self, field)
+        if field == 'parsed_date':
+            return str(value) if value else None
+        return value
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return self.get(field)
+
+    def to_dict(self):
+        """Plain dict for JSON/Parquet output"""
+        return {field: self.get(field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, Review):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __hash__(self):
+        # Equal records always share a fingerprint, so they hash alike
+        return hash(review_fingerprint(self))
+
+    def __repr__(self):
+        return f"Review({self.source!r}, {self.parsed_date}, {self.title[:40]!r})"
+
+
+def review_dict(review):
+    """JSON-serializable form of a review record or dict"""
+    return review.to_dict() if isinstance(review, Review) else review
+
+
+def links_to_page(url, href, page):
+    """Whether a Next link href from url points at ?page=N of the same listing"""
+    target = urlparse(urljoin(url, href))
+    return target.path == urlparse(url).path and dict(parse_qsl(target.query)).get('page') == str(page)
+
+
+def review_day(review):
+    """Publication date of a review as a date, or None"""
+    if isinstance(review, Review):
+        return review.parsed_date
+    return to_date(review.get('parsed_date') or review.get('date'))
+
+
+def review_fingerprint(review):
+    """Stable identity of a review across pages and runs"""
+    day = review_day(review)
+    parts = (review.get('source', ''), review.get('reviewer', ''), str(day) if day else review.get('date', ''),
+             review.get('title', ''), review.get('description', ''))
+    # str.split() collapses the same whitespace as re.sub(r'\s+', ' ', ...).strip(), several times faster
+    normalized = '\x1f'.join(' '.join(str(p or '').split()).lower() for p in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class ReviewStore:
+    """SQLite-backed review store keyed by source, product URL and review fingerprint, with resume checkpoints"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS reviews (
+            source TEXT NOT NULL,
+            product_url TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            company TEXT,
+            review_date TEXT,
+            data TEXT NOT NULL,
+            scraped_at TEXT NOT NULL,
+            PRIMARY KEY (source, product_url, fingerprint)
+        );
+        CREATE INDEX IF NOT EXISTS reviews_by_company ON reviews (source, company, review_date);
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            source TEXT NOT NULL,
+            product_url TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (source, product_url, start_date, end_date)
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            source TEXT NOT NULL,
+            product_url TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            completed_at TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path="output/reviews.db"):
+        """Open (or create) the store at path"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # Batch workers share one database file, so wait on locks instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def add_page(self, source, product_url, company, reviews, window, page):
+        """Store a page of reviews and checkpoint it in one transaction; returns dates of already-stored reviews"""
+        now = datetime.now().isoformat(timespec='seconds')
+        known = []
+        with self.conn:
+            for review in reviews:
+                day = review_day(review)
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (source, product_url, review_fingerprint(review), company, str(day) if day else None,
+                     json.dumps(review_dict(review), ensure_ascii=False), now))
+                if not cursor.rowcount and day:
+                    known.append(day)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (source, product_url, str(window[0]), str(window[1]), page, now))
+        return known
+
+    def checkpoint(self, source, product_url, window):
+        """Last completed page of an interrupted run over the same window, or 0"""
+        row = self.conn.execute(
+            "SELECT page FROM checkpoints WHERE source = ? AND product_url = ? AND start_date = ? AND end_date = ?",
+            (source, product_url, str(window[0]), str(window[1]))).fetchone()
+        return row[0] if row else 0
+
+    def finish(self, source, product_url, window):
+        """Mark a run as complete and drop its checkpoint"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM checkpoints WHERE source = ? AND product_url = ? AND start_date = ? AND end_date = ?",
+                (source, product_url, str(window[0]), str(window[1])))
+            self.conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                              (source, product_url, str(window[0]), str(window[1]),
+                               datetime.now().isoformat(timespec='seconds')))
+
+    def is_covered(self, source, product_url, start_date, day):
+        """Whether a completed run already scraped everything from start_date up to day"""
+        row = self.conn.execute(
+            "SELECT 1 FROM runs WHERE source = ? AND product_url = ? AND start_date <= ? AND end_date >= ? LIMIT 1",
+            (source, product_url, str(start_date), str(day))).fetchone()
+        return row is not None
+
+    def iter_reviews(self, source, company, start_date, end_date):
+        """Stream stored reviews for a company and window, newest first"""
+        rows = self.conn.execute(
+            "SELECT data FROM reviews WHERE source = ? AND company = ? AND review_date BETWEEN ? AND ? "
+            "ORDER BY review_date DESC",
+            (source, company, str(start_date), str(end_date)))
+        for data, in rows:
+            yield Review.from_dict(json.loads(data))
+
+    def reviews(self, source, company, start_date, end_date):
+        """Stored reviews for a company and window, newest first"""
+        return list(self.iter_reviews(source, company, start_date, end_date))
+
+    def close(self):
+        self.conn.close()
+
+
+class SearchCache:
+    """On-disk cache of (source, company) -> product URL, with a TTL and negative entries for companies not found"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            source TEXT NOT NULL,
+            company TEXT NOT NULL,
+            product_url TEXT,
+            resolved_at REAL NOT NULL,
+            PRIMARY KEY (source, company)
+        );
+    """
+
+    def __init__(self, path="output/search_cache.db", ttl_days=30, negative_ttl_hours=24):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_hours * 3600
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def key(company):
+        """Normalized company name: case, punctuation and spacing do not matter"""
+        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', company.lower())).strip()
+
+    def get(self, source, company):
+        """(True, product URL or None if known not to exist) for a fresh entry, else (False, None)"""
+        row = self.conn.execute("SELECT product_url, resolved_at FROM products WHERE source = ? AND company = ?",
+                                (source, self.key(company))).fetchone()
+        if row:
+            product_url, resolved_at = row
+            if time.time() - resolved_at < (self.ttl if product_url else self.negative_ttl):
+                self.stats['hits' if product_url else 'negative_hits'] += 1
+                return True, product_url
+        self.stats['misses'] += 1
+        return False, None
+
+    def put(self, source, company, product_url):
+        """Remember a search result; product_url None records that the company was not found"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?)",
+                              (source, self.key(company), product_url, time.time()))
+
+    def seed(self, csv_path):
+        """Pre-load product URLs from a CSV file with source,company,product_url columns; returns rows loaded"""
+        count = 0
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
+                if row.get('source') and row.get('company') and row.get('product_url'):
+                    self.put(row['source'].lower(), row['company'], row['product_url'])
+                    count += 1
+        return count
+
+    def close(self):
+        self.conn.close()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex fingerprints (double hashing; no false negatives)"""
+
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, fingerprint):
+        h1, h2 = int(fingerprint[:16], 16), int(fingerprint[16:32], 16) | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, fingerprint):
+        for position in self._positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+
+class ReviewIndex:
+    """
+    Index of review fingerprints seen by this and earlier runs.
+
+    A Bloom filter in memory answers "never seen" without touching disk; only filter hits are
+    confirmed against the exact SQLite table. New fingerprints are buffered and only written once
+    their reviews are saved, so a failed run never marks unsaved reviews as seen.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            fingerprint TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            run TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path="output/review_index.db", capacity=1000000, error_rate=0.01):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        existing = self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        self.bloom = BloomFilter(max(capacity, 2 * existing), error_rate)
+        for fingerprint, in self.conn.execute("SELECT fingerprint FROM fingerprints"):
+            self.bloom.add(fingerprint)
+        self.pending = {}
+        self.start_run()
+
+    def start_run(self):
+        """Begin a new run: duplicates are counted per run"""
+        self.run = datetime.now().isoformat(timespec='microseconds')
+        # A failed earlier job on this scraper never saved what it buffered
+        self.pending = {}
+        self.stats = {'checked': 0, 'duplicates': 0, 'repeated_in_run': 0, 'from_earlier_runs': 0,
+                      'disk_lookups': 0, 'false_positives': 0}
+
+    def seen(self, source, fingerprint):
+        """Whether the fingerprint was seen before; records it if not"""
+        self.stats['checked'] += 1
+        if fingerprint in self.pending:
+            run = self.run
+        elif fingerprint not in self.bloom:
+            run = None
+        else:
+            self.stats['disk_lookups'] += 1
+            row = self.conn.execute("SELECT run FROM fingerprints WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            run = row[0] if row else None
+            if not row:
+                self.stats['false_positives'] += 1
+
+        if run is None:
+            self.bloom.add(fingerprint)
+            self.pending[fingerprint] = source
+            return False
+        self.stats['duplicates'] += 1
+        self.stats['repeated_in_run' if run == self.run else 'from_earlier_runs'] += 1
+        return True
+
+    def flush(self):
+        """Write buffered fingerprints to disk; call once their reviews are saved"""
+        if not self.pending:
+            return
+        with self.conn:
+            # Another batch worker may have stored the same review meanwhile; the first one wins
+            self.conn.executemany("INSERT OR IGNORE INTO fingerprints VALUES (?, ?, ?)",
+                                  ((fp, source, self.run) for fp, source in self.pending.items()))
+        self.pending = {}
+
+    def close(self):
+        # Fingerprints still buffered belong to reviews that were never saved
+        self.pending = {}
+        self.conn.close()
+
+
+class DateWindowPlanner:
+    """Pagination planner for newest-first review listings restricted to a date window"""
+
+    def __init__(self, start_date, end_date, max_page=1024):
+        self.start_date = to_date(start_date)
+        self.end_date = to_date(end_date)
+        self.max_page = max_page
+        self.first_page = 1
+        self.probes = 0
+        self.pages_skipped = 0
+        self.stopped_at = None
+
+    def filter(self, reviews):
+        """Reviews inside the window; undated reviews are kept"""
+        kept = []
+        for review in reviews:
+            day = review_day(review)
+            if day is None or self.start_date <= day <= self.end_date:
+                kept.append(review)
+        return kept
+
+    def classify(self, reviews):
+        """'newer', 'older' or 'overlap' relative to the window, or 'unknown' if no review is dated"""
+        days = [d for d in map(review_day, reviews) if d]
+        if not days:
+            return 'unknown'
+        if min(days) > self.end_date:
+            return 'newer'
+        if max(days) < self.start_date:
+            return 'older'
+        return 'overlap'
+
+    def should_stop(self, reviews, page):
+        """True once a page is entirely older than the window; every later page is older still"""
+        if self.classify(reviews) == 'older':
+            self.stopped_at = page
+            log(f"⏹️ Page {page} is entirely older than {self.start_date} - stopping pagination")
+            return True
+        return False
+
+    def find_first_page(self, load_page):
+        """
+        Find the first page that reaches end_date without walking every newer page.
+
+        load_page(n) returns the reviews on page n, or None past the last page. Pages are probed
+        at 1, 2, 4, 8, ... until one reaches the window, then binary-searched in between.
+        """
+        probed = set()
+
+        def reaches_window(page):
+            self.probes += 1
+            probed.add(page)
+            reviews = load_page(page)
+            return not reviews or self.classify(reviews) != 'newer'
+
+        if reaches_window(1):
+            return 1
+
+        low, high = 1, 2
+        while high < self.max_page and not reaches_window(high):
+            low, high = high, high * 2
+
+        # Invariant: page `low` is entirely newer, page `high` reaches the window (or is past the end)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if reaches_window(middle):
+                high = middle
+            else:
+                low = middle
+
+        self.first_page = high
+        self.pages_skipped = len(set(range(1, high)) - probed)
+        log(f"⏩ Jumped to page {high}: skipped {self.pages_skipped} newer pages with {self.probes} probes")
+        return high
+
+    def report(self):
+        """Summary of pages avoided"""
+        return {
+            'first_page': self.first_page,
+            'probes': self.probes,
+            'pages_skipped': self.pages_skipped,
+            'stopped_at': self.stopped_at,
+        }
+
+
+# Per-source extraction plans: the review container, each field as
+# (selector, attribute or None for text, index of the match), and the Next link.
+EXTRACTION_PLANS = {name: plugin.extraction_plan() for name, plugin in SOURCE_PLUGINS.items()}
+
+
+# Runs in the page: the outerHTML of the outermost review containers and of the Next link's
+# pagination block, wrapped as a small document, plus the UTF-8 size of the whole page
+SCOPED_EXTRACT_SCRIPT = """
+const [containerSelector, linkSelector, linkScope] = arguments;
+const parts = [];
+for (const el of document.querySelectorAll(containerSelector)) {
+    if (!el.parentElement || !el.parentElement.closest(containerSelector)) parts.push(el.outerHTML);
+}
+const scopes = new Set();
+for (const el of document.querySelectorAll(linkSelector)) {
+    const scope = linkScope ? el.closest(linkScope) : el;
+    if (scope) scopes.add(scope);
+}
+for (const el of scopes) parts.push(el.outerHTML);
+return {html: '<html><body>' + parts.join('') + '</body></html>',
+        full: new TextEncoder().encode(document.documentElement.outerHTML).length};
+"""
+
+
+class ScopedCapture:
+    """Takes only the review containers and pagination out of the browser instead of the full page_source"""
+
+    def __init__(self, plans=EXTRACTION_PLANS):
+        self.arguments = {}
+        for source, plan in plans.items():
+            # The Next link's ancestor compounds scope the pagination block; bracketed values may hold spaces
+            link = selector_compounds(plan['next_link'][0])
+            self.arguments[source] = (plan['container'], plan['next_link'][0], ' '.join(link[:-1]) or None)
+        self.stats = {'pages': 0, 'bytes': 0, 'full_page_bytes': 0}
+
+    def covers(self, source):
+        return source in self.arguments
+
+    def capture(self, driver, source):
+        """A document holding just the page's review containers and Next link, parsed like a full page"""
+        result = driver.execute_script(SCOPED_EXTRACT_SCRIPT, *self.arguments[source])
+        html = result['html']
+        self.stats['pages'] += 1
+        self.stats['bytes'] += len(html.encode('utf-8'))
+        self.stats['full_page_bytes'] += result['full']
+        return html
+
+    def report(self):
+        saving = 1 - self.stats['bytes'] / self.stats['full_page_bytes'] if self.stats['full_page_bytes'] else 0.0
+        return dict(self.stats, saving=round(saving, 3))
+
+COMPOUND_SELECTOR = re.compile(r'^(?P<tag>[\w-]+)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$')
+SELECTOR_PART = re.compile(r'\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)(?:=["\']?(?P<value>[^"\'\]]*)["\']?)?\]')
+SELECTOR_COMPOUND = re.compile(r'(?:[^\s\[]|\[[^\]]*\])+')
+
+
+def selector_compounds(selector):
+    """Compounds of a descendant selector, splitting on whitespace outside [...]"""
+    return SELECTOR_COMPOUND.findall(selector)
+
+
+def compile_selector(selector):
+    """Compile a descendant chain of tag.class[attr=value] compounds into (tag, classes, attrs) tuples"""
+    chain = []
+    for compound in selector_compounds(selector):
+        match = COMPOUND_SELECTOR.match(compound)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector}")
+        classes, attrs = [], []
+        for part in SELECTOR_PART.finditer(match.group('rest')):
+            if part.group('cls'):
+                classes.append(part.group('cls'))
+            else:
+                attrs.append((part.group('attr'), part.group('value')))
+        chain.append((match.group('tag'), frozenset(classes), tuple(attrs)))
+    return tuple(chain)
+
+
+def selector_to_xpath(chain):
+    """XPath equivalent of a compiled selector chain, for locating containers in C"""
+    steps = []
+    for tag, classes, attrs in chain:
+        predicates = [f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in sorted(classes)]
+        predicates += [f"@{name}='{value}'" if value is not None else f"@{name}" for name, value in attrs]
+        steps.append((tag or '*') + ''.join(f"[{p}]" for p in predicates))
+    return '//' + '//'.join(steps)
+
+
+class ExtractionEngine:
+    """lxml-based extractor that compiles each source's plan once and reads every field in one walk per review"""
+
+    SKIP_TEXT = ('script', 'style')
+
+    def __init__(self, plans=EXTRACTION_PLANS):
+        import lxml.html
+        from lxml import etree
+        self.lxml_html = lxml.html
+        self.plans = {}
+        for source, plan in plans.items():
+            self.plans[source] = {
+                'container': etree.XPath(selector_to_xpath(compile_selector(plan['container']))),
+                'fields': [(name, compile_selector(selector), attr, index)
+                           for name, (selector, attr, index) in plan['fields'].items()],
+                'next_link': (etree.XPath(selector_to_xpath(compile_selector(plan['next_link'][0]))),
+                              plan['next_link'][1]),
+            }
+
+    @staticmethod
+    def matches(node, compound):
+        """Whether an element matches one (tag, classes, attrs) compound"""
+        tag, classes, attrs = compound
+        if tag and node.tag != tag:
+            return False
+        if classes and not classes <= set((node.get('class') or '').split()):
+            return False
+        for name, value in attrs:
+            actual = node.get(name)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+
+    def matches_chain(self, node, chain):
+        """Whether an element matches a descendant selector chain"""
+        if not self.matches(node, chain[-1]):
+            return False
+        remaining = len(chain) - 2
+        for ancestor in node.iterancestors():
+            if remaining < 0:
+                break
+            if self.matches(ancestor, chain[remaining]):
+                remaining -= 1
+        return remaining < 0
+
+    def text(self, node):
+        """Concatenated stripped text, skipping scripts, styles and comments (like get_text(strip=True))"""
+        parts = []
+
+        def collect(element):
+            if isinstance(element.tag, str) and element.tag not in self.SKIP_TEXT and element.text:
+                parts.append(element.text.strip())
+            for child in element:
+                collect(child)
+                if child.tail:
+                    parts.append(child.tail.strip())
+
+        collect(node)
+        return ''.join(parts)
+
+    def extract_fields(self, container, fields):
+        """Read all fields of one review in a single walk over its subtree"""
+        values = dict.fromkeys(name for name, _, _, _ in fields)
+        pending = list(fields)
+        seen = {}
+        for node in container.iterdescendants():
+            if not isinstance(node.tag, str):
+                continue
+            for field in pending:
+                name, chain, attr, index = field
+                if not self.matches_chain(node, chain):
+                    continue
+                count = seen.get(name, 0)
+                seen[name] = count + 1
+                if count == index:
+                    values[name] = node.get(attr) if attr else self.text(node)
+                    pending = [f for f in pending if f is not field]
+            if not pending:
+                break
+        return values
+
+    def document(self, html):
+        """Parsed lxml tree of a page, or None if it is empty"""
+        if not html or not html.strip():
+            return None
+        try:
+            return self.lxml_html.fromstring(html)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration
+            return self.lxml_html.fromstring(html.encode('utf-8'))
+
+    def extract(self, source, html):
+        """(field dicts for every review container, or None if there are none; href of the Next link)"""
+        tree = self.document(html)
+        if tree is None:
+            return None, None
+        return self.extract_tree(source, tree)
+
+    def extract_tree(self, source, tree):
+        """extract() on an already parsed page"""
+        plan = self.plans[source]
+        containers = plan['container'](tree)
+
+        next_href = None
+        links, label = plan['next_link']
+        for link in links(tree):
+            if label is None or label in self.text(link):
+                next_href = link.get('href')
+                break
+
+        if not containers:
+            return None, next_href
+        return [self.extract_fields(container, plan['fields']) for container in containers], next_href
+
+
+def load_extraction_engine(parser='auto'):
+    """ExtractionEngine for parser 'lxml'/'auto', or None to use BeautifulSoup's html.parser"""
+    if parser == 'html.parser':
+        return None
+    try:
+        return ExtractionEngine()
+    except ImportError:
+        if parser == 'lxml':
+            raise
+        log("⚠️  lxml is not installed - falling back to BeautifulSoup html.parser")
+        return None
+
+
 class ReviewScraper:
-    def __init__(self, chromedriver_path):
-        """Initialize scraper with ChromeDriver path"""
+    def __init__(self, chromedriver_path, backend='selenium', http_options=None, parser='auto'):
+        """Initialize scraper with ChromeDriver path and preferred fetch backend"""
         self.chromedriver_path = chromedriver_path
+        self.extractor = load_extraction_engine(parser)
+        self.backend = backend
+        self.http_options = http_options or {}
+        self.http = None
+        self.lean = None
+        self.capture = None
+        self.scoped = None
         self.driver = None
         self.wait = None
+        self.waiter = None
+        self.last_error = None
+        self.last_plan = None
+        self.cut_short_by = None
+        self.store = None
+        self.sink = None
+        self.reviews_seen = 0
+        self.page_cache = None
+        self.incremental = True
+        self.current_job = None
+        self.on_page = None
+        self.index = None
+        self.prefetch = 1
+        self.limiter = RateLimiter()
+        self.search_cache = None
+        self.metrics = Metrics()
 
     def setup_driver(self):
         """Setup Chrome WebDriver with options"""
@@ -48,524 +2059,2562 @@ class ReviewScraper:
             options.add_experimental_option('useAutomationExtension', False)
             options.add_argument("--log-level=3")
             options.add_argument("--disable-logging")
+            if self.lean:
+                self.lean.configure(options)
+            if self.capture:
+                options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
             service = Service(self.chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=options)
+            with self.metrics.stage('driver_start'):
+                self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.wait = WebDriverWait(self.driver, 15)
+            self.waiter = AdaptiveWait(self.driver)
+            self.waiter.metrics = self.metrics
+            if self.lean or self.capture:
+                self.waiter.on_page_end = self.end_page_network
+
+            log("✅ Chrome WebDriver initialized successfully!")
+            return True
+
+        except Exception as e:
+            log(f"❌ Failed to initialize WebDriver: {e}")
+            return False
+
+    def close_driver(self):
+        """Close WebDriver"""
+        if self.driver:
+            try:
+                self.driver.quit()
+                log("🔒 WebDriver closed successfully!")
+            except:
+                pass
+            self.driver = None
+        if self.http:
+            self.http.close()
+            self.http = None
+
+    def poll_network(self):
+        """Drain Chrome's network log into the lean-mode counters and the response capture"""
+        if not self.driver or not (self.lean or self.capture):
+            return
+        events = LeanBrowser.network_events(self.driver)
+        if self.lean:
+            self.lean.observe(events)
+        if self.capture:
+            self.capture.observe(events)
+
+    def reset_capture(self):
+        """Before leaving a page: drain its network events and drop its captured responses"""
+        if self.capture and self.driver:
+            self.poll_network()
+            self.capture.reset()
+
+    def end_page_network(self):
+        """Per-page network stats for AdaptiveWait.end_page"""
+        self.poll_network()
+        return self.lean.page_report() if self.lean else {}
+
+    def captured_ready(self, source):
+        """Wait condition: a review API response for the source has been captured"""
+        self.poll_network()
+        return self.capture.ready(source)
+
+    def captured_reviews(self, source):
+        """Reviews mapped from captured API responses, or None to fall back to DOM parsing"""
+        if not self.capture:
+            return None
+        self.poll_network()
+        reviews = []
+        for payload in self.capture.take(self.driver, source):
+            for obj in find_json_reviews(payload):
+                fields = json_review_fields(obj)
+                try:
+                    review = self.build_review(source, fields)
+                except Exception as e:
+                    log(f"⚠️  Error mapping captured {source} review: {e}")
+                    continue
+                if review:
+                    reviews.append(review)
+        if not reviews:
+            self.capture.stats['fallbacks'] += 1
+            return None
+        self.capture.stats['reviews'] += len(reviews)
+        log(f"📡 Took {len(reviews)} reviews from captured API responses")
+        return reviews
+
+    def fetcher_for(self, source):
+        """Fetch backend for a source: the preferred backend if the source supports it, else Selenium"""
+        if self.backend == 'http' and 'http' in SOURCE_BACKENDS.get(source, ()):
+            if not self.http:
+                self.http = HTTPFetcher(cache=self.page_cache, limiter=self.limiter, **self.http_options)
+                self.http.metrics = self.metrics
+            return self.http
+        return SeleniumFetcher(self, source)
+
+    def navigate(self, url):
+        """Load url in the browser once the rate limiter allows it"""
+        if self.limiter:
+            paced = self.limiter.acquire(url)
+            if paced:
+                self.metrics.observe('rate_limit', paced)
+        self.reset_capture()
+        with self.metrics.stage('navigate'):
+            self.driver.get(url)
+
+    def click(self, element):
+        """Click a navigation element (e.g. Next) once the rate limiter allows another request"""
+        if self.limiter:
+            self.limiter.acquire(self.driver.current_url)
+        self.reset_capture()
+        self.driver.execute_script("arguments[0].click();", element)
+
+    def page_blocked(self):
+        """Whether the browser is showing a bot challenge or block page"""
+        try:
+            return bool(CHALLENGE_TITLE.search(self.driver.title or ''))
+        except WebDriverException:
+            return False
+
+    def wait_for_page(self, source, wait):
+        """Run a page's readiness wait; on a timeout or challenge page back off and reload until the limiter gives up"""
+        url = self.driver.current_url
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                wait()
+            except TimeoutException:
+                delay = self.limiter.backoff(url, attempt) if self.limiter else None
+                if delay is None:
+                    raise
+                reason = "Challenge page" if self.page_blocked() else "Timeout"
+                log(f"🐢 {reason} on {source} - reloading in {delay:.1f}s")
+                time.sleep(delay)
+                self.limiter.acquire(url)
+                self.reset_capture()
+                self.driver.refresh()
+                attempt += 1
+                continue
+            if self.limiter:
+                self.limiter.success(url, time.monotonic() - started)
+            return
+
+    def needs_browser(self, source):
+        """Whether scraping this source requires a Chrome session"""
+        return self.fetcher_for(source).name == 'selenium'
+
+    def resume_page(self, source):
+        """Last page completed by an interrupted run of the current job, or 0"""
+        job = self.current_job
+        if not self.store or not job:
+            return 0
+        page = self.store.checkpoint(source, job['product_url'], job['window'])
+        if page:
+            log(f"⏯️  Resuming {source} after page {page}")
+        return page
+
+    def drop_duplicates(self, source, page_reviews):
+        """Reviews not seen before on another page or in an earlier run, and the dates of those dropped"""
+        if not self.index:
+            return page_reviews, []
+        started = time.perf_counter()
+        fresh, known = [], []
+        for review in page_reviews:
+            if self.index.seen(source, review_fingerprint(review)):
+                day = review_day(review)
+                if day:
+                    known.append(day)
+            else:
+                fresh.append(review)
+        self.metrics.observe('dedup', time.perf_counter() - started)
+        if len(fresh) < len(page_reviews):
+            self.metrics.count('duplicates', len(page_reviews) - len(fresh))
+            log(f"🧬 Dropped {len(page_reviews) - len(fresh)} duplicate reviews")
+        return fresh, known
+
+    def keep_page(self, reviews, page_reviews):
+        """Add a page to the in-memory result unless reviews are streamed to a sink; returns the run total"""
+        self.reviews_seen += len(page_reviews)
+        self.metrics.count('reviews', len(page_reviews))
+        if self.on_page:
+            self.on_page(page_reviews)
+        if not self.sink:
+            reviews.extend(page_reviews)
+        return self.reviews_seen
+
+    def mark_saved(self):
+        """Record the fingerprints of reviews that are now saved, so later runs drop them as duplicates"""
+        if self.index:
+            self.index.flush()
+
+    def record_page(self, source, page, reviews, known=()):
+        """Persist a finished page; True if it reached reviews that an earlier complete run already covers"""
+        job = self.current_job
+        if self.sink and not self.store:
+            # Without a store the sink is the primary copy, so it gets every page as soon as it is parsed
+            with self.metrics.stage('sink'):
+                self.sink.write_page(reviews)
+            self.mark_saved()
+        if not self.store or not job:
+            return False
+        with self.metrics.stage('store'):
+            known = list(known) + self.store.add_page(source, job['product_url'], job['company'], reviews,
+                                                      job['window'], page)
+        self.mark_saved()
+        if self.incremental and known and self.store.is_covered(source, job['product_url'],
+                                                                job['window'][0], max(known)):
+            log(f"⏹️ Reached reviews stored by an earlier run - stopping at page {page}")
+            return True
+        return False
+
+    def pages_scraped(self):
+        """Number of pages processed by the current driver"""
+        return len(self.waiter.page_waits) if self.waiter else 0
+
+    def browser_memory_mb(self):
+        """Resident memory of chromedriver and every Chrome process under it in MB, or None if unavailable"""
+        if not self.driver:
+            return None
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        return process_tree_rss_mb(process.pid) if process else None
+
+    def parse_date(self, date_str, source):
+        """Parse a date string in one of the source's declared formats"""
+        review_date = DATES.parse(date_str, source)
+        if date_str and not review_date:
+            log(f"⚠️  Could not parse date: '{date_str}' for {source}")
+        return review_date
+
+    def search_product(self, source, company):
+        """Search for company and return product reviews URL"""
+        if self.search_cache:
+            cached, product_url = self.search_cache.get(source, company)
+            if cached and product_url:
+                log(f"📌 Cached product page for '{company}' on {source}: {product_url}")
+                return product_url
+            if cached:
+                raise ValueError(f"❌ Could not find '{company}' on {source} (cached result; "
+                                 f"use --no-search-cache to search again)")
+
+        try:
+            with self.metrics.stage('search'):
+                product_url = self._search_product(source, company)
+        except ValueError:
+            # Only a loaded search page without a matching result; timeouts raise SearchTimeoutError
+            if self.search_cache:
+                self.search_cache.put(source, company, None)
+            raise
+        if self.search_cache:
+            self.search_cache.put(source, company, product_url)
+        return product_url
+
+    def _search_product(self, source, company):
+        """Run the source's search strategies in order and return the first product reviews URL"""
+        log(f"🔍 Searching for '{company}' on {source}...")
+        fetcher = self.fetcher_for(source)
+        timed_out = None
+        try:
+            for strategy in SOURCE_PLUGINS[source].search:
+                try:
+                    product_url = self.run_search(source, strategy, company, fetcher)
+                except SearchTimeoutError as e:
+                    log(f"🐢 {e}")
+                    timed_out = e
+                    continue
+                if product_url:
+                    log(f"✅ Found product page: {product_url}")
+                    return product_url
+        except Exception as e:
+            raise Exception(f"❌ Search failed: {e}")
+        if timed_out:
+            raise SearchTimeoutError(f"❌ Search for '{company}' on {source} did not complete: {timed_out}")
+        raise ValueError(f"❌ Could not find '{company}' on {source}. Check company name spelling.")
+
+    def run_search(self, source, strategy, company, fetcher):
+        """Product reviews URL found by one search strategy, or None"""
+        kind = strategy[0]
+        if kind == 'results':
+            _, url_template, link_selector = strategy
+            search_url = url_template.format(query=company.replace(' ', '%20'))
+            if fetcher.name == 'http':
+                link = BeautifulSoup(fetcher.fetch(search_url), 'html.parser').select_one(link_selector)
+                return urljoin(search_url, link['href']) if link and link.get('href') else None
+            self.navigate(search_url)
+            try:
+                link = self.waiter.until(source, EC.element_to_be_clickable((By.CSS_SELECTOR, link_selector)),
+                                         "search result")
+            except TimeoutException as e:
+                # No result is only "not found" if the results page itself finished loading
+                if self.page_blocked() or self.driver.execute_script("return document.readyState") != 'complete':
+                    raise SearchTimeoutError(f"Search results page did not load: {e}")
+                return None
+            return link.get_attribute('href')
+
+        if kind == 'autocomplete':
+            if fetcher.name == 'http':
+                return None
+            _, page, input_selector, suggestion_selector = strategy
+            self.navigate(page)
+            try:
+                search_box = self.waiter.until(
+                    source, EC.element_to_be_clickable((By.CSS_SELECTOR, input_selector)), "search box")
+                search_box.clear()
+                search_box.send_keys(company)
+                suggestion = self.waiter.until(
+                    source, EC.element_to_be_clickable((By.CSS_SELECTOR, suggestion_selector)),
+                    "autocomplete suggestion")
+            except TimeoutException as e:
+                # A missing suggestion may just be a slow one
+                raise SearchTimeoutError(f"Autocomplete search did not answer: {e}")
+            return suggestion.get_attribute('href')
+
+        raise ValueError(f"Unknown search strategy '{kind}' for {source}")
+
+    def build_review(self, source, fields, review_date=None):
+        """Turn extracted field values into a Review as the source plugin declares, or None if it lacks content"""
+        plugin = SOURCE_PLUGINS[source]
+        date_str = fields.get('date')
+        if review_date is None:
+            review_date = DATES.parse(date_str, source)
+        if plugin.require_date and not review_date:
+            raise ValueError(f"missing or invalid date '{date_str}'")
+
+        title = fields.get('title')
+        title = "No title" if title is None else title
+        text = fields.get('text') or ""
+        if plugin.require_content and (title == "No title" or not (text or fields.get('rating'))):
+            return None
+
+        return Review(
+            title=title,
+            description=text,
+            date=review_date.isoformat() if review_date else date_str,
+            parsed_date=review_date,
+            rating=fields.get('rating'),
+            reviewer='Anonymous' if fields.get('reviewer') is None else fields['reviewer'],
+            job_title=fields.get('job_title') or "",
+            company_size=fields.get('company_size') or "",
+            source=source,
+        )
+
+    def build_reviews(self, source, records):
+        """Reviews from extracted field dicts, skipping (and logging) ones that cannot be built"""
+        reviews = []
+        records = list(records)
+        days = DATES.parse_many([fields.get('date') for fields in records], source)
+        for fields, review_date in zip(records, days):
+            try:
+                review = self.build_review(source, fields, review_date)
+            except Exception as e:
+                log(f"⚠️  Error parsing {source} review: {e}")
+                continue
+            if review:
+                reviews.append(review)
+        return reviews
+
+    def extract_soup(self, source, soup):
+        """ExtractionEngine.extract_tree() for a BeautifulSoup page: (field dicts or None, Next link href)"""
+        plan = EXTRACTION_PLANS[source]
+        link_selector, label = plan['next_link']
+        next_link = next((a for a in soup.select(link_selector) if label is None or label in a.get_text()), None)
+        next_href = next_link.get('href') if next_link else None
+
+        containers = soup.select(plan['container'])
+        if not containers:
+            return None, next_href
+        records = []
+        for container in containers:
+            fields = {}
+            for name, (selector, attr, index) in plan['fields'].items():
+                matches = container.select(selector)
+                node = matches[index] if len(matches) > index else None
+                fields[name] = None if node is None else node.get(attr) if attr else node.get_text(strip=True)
+            records.append(fields)
+        return records, next_href
+
+    def parse_page(self, source, html):
+        """Parse a page's reviews with the fast engine (or BeautifulSoup): (reviews or None, next href)"""
+        if self.extractor:
+            with self.metrics.stage('parse'):
+                tree = self.extractor.document(html)
+            with self.metrics.stage('extract'):
+                records, next_href = self.extractor.extract_tree(source, tree) if tree is not None else (None, None)
+        else:
+            with self.metrics.stage('parse'):
+                soup = BeautifulSoup(html, 'html.parser')
+            with self.metrics.stage('extract'):
+                records, next_href = self.extract_soup(source, soup)
+        if records is None:
+            return None, next_href
+
+        with self.metrics.stage('extract'):
+            reviews = self.build_reviews(source, records)
+        self.metrics.count('reviews_parsed', len(reviews))
+        return reviews, next_href
+
+    def scrape_source(self, source, product_url, start_date, end_date):
+        """
+        Scrape a product's reviews within a date range the way its source plugin declares.
+
+        Returns (reviews, complete): complete is False when pagination was cut short (a timeout, an
+        open circuit, a failed fetch or a page without reviews) rather than ending at the last page,
+        the end of the window or reviews an earlier run already stored.
+        """
+        plugin = SOURCE_PLUGINS[source]
+        fetcher = self.fetcher_for(source)
+        planner = self.last_plan = DateWindowPlanner(start_date, end_date)
+        self.cut_short_by = None
+        if fetcher.name == 'http':
+            reviews = self.scrape_http(plugin, fetcher, planner, product_url)
+        else:
+            reviews = self.scrape_browser(plugin, fetcher, planner, product_url)
+        return reviews, self.cut_short_by is None
+
+    def cut_short(self, reason):
+        """Stop pagination early: the run keeps its checkpoint and is not recorded as complete"""
+        log(f"⚠️ {reason}")
+        self.cut_short_by = reason
+
+    def scrape_browser(self, plugin, fetcher, planner, product_url):
+        """Scrape listing pages in Chrome, clicking Next (or loading numbered pages in parallel tabs)"""
+        source = plugin.name
+        log(f"📄 Scraping {plugin.label} reviews from {product_url}")
+
+        def wait_for_dom():
+            self.waiter.until(source, EC.presence_of_all_elements_located((By.CSS_SELECTOR, plugin.ready)),
+                              "review list")
+            self.waiter.wait_settled(source)
+
+        def wait_for_reviews():
+            if self.capture:
+                # Either the review API answers or the server-rendered reviews are there
+                self.waiter.until(source, lambda d: self.captured_ready(source)
+                                  or d.find_elements(By.CSS_SELECTOR, plugin.container), "review data")
+                if self.capture.ready(source):
+                    return
+            wait_for_dom()
+
+        parsed = {}
+
+        def load_page(page):
+            """Open a page directly by number and return its reviews (for the date-window search)"""
+            self.navigate(page_url(product_url, page))
+            try:
+                # Probes are parsed from the DOM, whatever the review API has answered
+                self.wait_for_page(source, wait_for_dom)
+            except (TimeoutException, CircuitOpenError):
+                return None
+            parsed[page] = self.parse_page(source, fetcher.page_source())
+            return parsed[page][0]
+
+        resume = self.resume_page(source)
+        if plugin.pagination == 'numbered':
+            first_page = resume + 1 if resume else planner.find_first_page(load_page)
+            planner.first_page = first_page
+        else:
+            # Pages are reached by clicking Next, so only the early stop applies
+            first_page = resume + 1
+
+        if self.prefetch > 1 and not self.capture:
+            reviews = self.scrape_prefetched(source, fetcher, planner, product_url, first_page,
+                                             parsed.get(first_page))
+            if reviews is not None:
+                return reviews
+            log("↪️  Pages are not addressable by number - clicking through instead")
+
+        shown = None
+        if plugin.pagination == 'numbered':
+            # The last probe often is the first page: keep it and its parsed reviews instead of loading it again
+            if self.driver.current_url == page_url(product_url, first_page):
+                shown = parsed.get(first_page)
+            if not shown:
+                self.navigate(page_url(product_url, first_page))
+            page_count = first_page - 1
+        else:
+            self.navigate(product_url)
+            page_count = 0
+
+        reviews = []
+        while True:
+            page_count += 1
+            log(f"📑 Processing {plugin.label} page {page_count}...", source=source, page=page_count)
+            self.metrics.start_page(source, page_count)
+            self.waiter.start_page(source, page_count)
+            probed, shown = shown, None
+
+            try:
+                if not probed:
+                    self.wait_for_page(source, wait_for_reviews)
+            except (TimeoutException, CircuitOpenError) as e:
+                self.cut_short(f"Timeout waiting for reviews to load: {e}")
+                self.waiter.end_page()
+                break
+
+            if page_count <= resume:
+                log(f"⏭️  Page {page_count} already stored")
+            else:
+                page_reviews = probed[0] if probed else self.captured_reviews(source)
+                if page_reviews is None and self.capture and not probed:
+                    # The captured responses held no reviews; the DOM has not been waited for yet
+                    try:
+                        self.wait_for_page(source, wait_for_dom)
+                    except (TimeoutException, CircuitOpenError) as e:
+                        self.cut_short(f"Timeout waiting for reviews to load: {e}")
+                        self.waiter.end_page()
+                        break
+                if page_reviews is None and not probed:
+                    page_reviews, _ = self.parse_page(source, fetcher.page_source())
+
+                if page_reviews is None:
+                    # An empty first page is an empty listing; later pages were reached through a Next link
+                    if page_count > first_page:
+                        self.cut_short(f"No review elements found on page {page_count}")
+                    else:
+                        log("⚠️  No review elements found on this page")
+                    self.waiter.end_page()
+                    break
+
+                in_window, known = self.drop_duplicates(source, planner.filter(page_reviews))
+                total = self.keep_page(reviews, in_window)
+                log(f"✅ Found {len(in_window)} reviews on this page (Total: {total})",
+                    reviews=len(in_window), total=total)
+
+                if (self.record_page(source, page_count, in_window, known)
+                        or planner.should_stop(page_reviews, page_count)):
+                    self.waiter.end_page()
+                    break
+
+            more = self.click_next(plugin)
+            self.waiter.end_page()
+            if not more:
+                break
+
+        return reviews
+
+    def click_next(self, plugin):
+        """Click the listing's Next link and wait for the reviews to change; False on the last page"""
+        link_selector, label = plugin.next_link
+        next_button = next((link for link in self.driver.find_elements(By.CSS_SELECTOR, link_selector)
+                            if label is None or label in link.text), None)
+        if not (next_button and next_button.is_displayed()):
+            log("⏹️ No more pages to scrape")
+            return False
+
+        log("🔄 Clicking Next page...")
+        with self.metrics.stage('paginate'):
+            old_nodes = self.driver.find_elements(By.CSS_SELECTOR, plugin.container)
+            old_node = old_nodes[0] if old_nodes else None
+            try:
+                self.click(next_button)
+                self.waiter.wait_for_page_change(plugin.name, old_node, plugin.container)
+            except CircuitOpenError as e:
+                self.cut_short(f"Next page did not load: {e}")
+                return False
+            except TimeoutException as e:
+                # A slow page is not the last page: wait once more with a longer timeout before giving up
+                log(f"🐢 Next page is slow ({e}) - waiting longer")
+                try:
+                    self.waiter.wait_for_page_change(plugin.name, old_node, plugin.container, patience=2)
+                except TimeoutException as e:
+                    self.cut_short(f"Next page did not load: {e}")
+                    return False
+        return True
+
+    def scrape_prefetched(self, source, fetcher, planner, product_url, first_page, probed=None):
+        """
+        Walk numbered listing pages with the next few already loading in parallel tabs.
+
+        probed: the first page's (reviews, next_href) already parsed by the date-window search; the
+        page is not opened again.
+        Returns None before keeping any review if the first page has no reviews or its Next link is
+        not a ?page=N URL, so the caller can click through instead.
+        """
+        ready = SOURCE_PLUGINS[source].ready
+
+        def loaded(driver):
+            # Like wait_for_reviews: client-rendered listings are 'complete' long before their reviews exist
+            if driver.current_url == 'about:blank':
+                return False
+            return (driver.execute_script("return document.readyState") != 'loading'
+                    and bool(driver.find_elements(By.CSS_SELECTOR, ready)))
+
+        on_new_tab = (lambda: self.lean.apply(self.driver, source)) if self.lean else None
+        prefetcher = TabPrefetcher(fetcher, self.prefetch, on_new_tab)
+        log(f"🗂️  Loading {self.prefetch} pages at a time in parallel tabs")
+        reviews, page, attempt = [], first_page, 0
+        try:
+            while True:
+                try:
+                    prefetcher.fill(lambda number: page_url(product_url, number), page + 1 if probed else page)
+                except CircuitOpenError as e:
+                    self.cut_short(str(e))
+                    break
+                if not attempt:
+                    log(f"📑 Processing {source} page {page}...", source=source, page=page)
+                    self.metrics.start_page(source, page)
+                self.waiter.start_page(source, page)
+                if probed:
+                    (page_reviews, next_href), probed = probed, None
+                else:
+                    started = time.monotonic()
+                    try:
+                        html = prefetcher.take(page, lambda: self.waiter.until(source, loaded, "prefetched page"))
+                    except TimeoutException as e:
+                        delay = self.limiter.backoff(page_url(product_url, page), attempt) if self.limiter else None
+                        if delay is None:
+                            self.cut_short(f"Timeout waiting for page {page}: {e}")
+                            self.waiter.end_page()
+                            break
+                        # The page's tab is closed; the next fill opens it again. The failed load keeps its
+                        # own wait record, while the page's metrics span every attempt
+                        log(f"🐢 Timeout on {source} page {page} - reloading in {delay:.1f}s")
+                        self.waiter.end_page()
+                        time.sleep(delay)
+                        attempt += 1
+                        continue
+                    attempt = 0
+                    if self.limiter:
+                        self.limiter.success(page_url(product_url, page), time.monotonic() - started)
+                    page_reviews, next_href = self.parse_page(source, html)
+
+                if page == first_page and (page_reviews is None
+                                           or next_href and not links_to_page(product_url, next_href, page + 1)):
+                    self.waiter.end_page()
+                    return None
+                if page_reviews is None:
+                    self.cut_short(f"No review elements found on page {page}")
+                    self.waiter.end_page()
+                    break
+
+                in_window, known = self.drop_duplicates(source, planner.filter(page_reviews))
+                total = self.keep_page(reviews, in_window)
+                log(f"✅ Found {len(in_window)} reviews on this page (Total: {total})",
+                    reviews=len(in_window), total=total)
+                self.waiter.end_page()
+
+                if self.record_page(source, page, in_window, known) or planner.should_stop(page_reviews, page):
+                    break
+                if not next_href:
+                    log("⏹️ No more pages to scrape")
+                    break
+                page += 1
+        finally:
+            prefetcher.close()
+        log(f"🗂️  {prefetcher.stats['used']} pages loaded in parallel tabs, "
+            f"{prefetcher.stats['discarded']} prefetched but not needed")
+        return reviews
+
+    def scrape_http(self, plugin, fetcher, planner, product_url):
+        """Scrape listing pages over the HTTP backend, following the Next link's href"""
+        source = plugin.name
+        log(f"📄 Scraping {plugin.label} reviews over HTTP from {product_url}")
+        parsed = {}
+
+        def load_page(page):
+            """Fetch a page directly by number and return its reviews (for the date-window search)"""
+            try:
+                parsed[page] = self.parse_page(source, fetcher.fetch(page_url(product_url, page)))
+            except (ConnectionError, OSError, http.client.HTTPException):
+                return None
+            return parsed[page][0]
+
+        resume = self.resume_page(source)
+        if plugin.pagination == 'numbered':
+            first_page = resume + 1 if resume else planner.find_first_page(load_page)
+            planner.first_page = first_page
+            url = page_url(product_url, first_page)
+        else:
+            first_page, url = 1, product_url
+
+        reviews = []
+        page_count = first_page - 1
+
+        while url:
+            page_count += 1
+            log(f"📑 Processing {plugin.label} page {page_count}...", source=source, page=page_count)
+            self.metrics.start_page(source, page_count)
+
+            try:
+                page_reviews, next_href = parsed.pop(page_count, None) or self.parse_page(source, fetcher.fetch(url))
+            except (ConnectionError, OSError, http.client.HTTPException) as e:
+                self.cut_short(f"Failed to fetch {url}: {e}")
+                break
+            parsed.clear()
+
+            if page_count <= resume:
+                log(f"⏭️  Page {page_count} already stored")
+            else:
+                if page_reviews is None:
+                    if page_count > first_page:
+                        self.cut_short(f"No review elements found on page {page_count}")
+                    else:
+                        log("⚠️  No review elements found on this page")
+                    break
+
+                in_window, known = self.drop_duplicates(source, planner.filter(page_reviews))
+                total = self.keep_page(reviews, in_window)
+                log(f"✅ Found {len(in_window)} reviews on this page (Total: {total})",
+                    reviews=len(in_window), total=total)
+
+                if (self.record_page(source, page_count, in_window, known)
+                        or planner.should_stop(page_reviews, page_count)):
+                    break
+
+            url = urljoin(url, next_href) if next_href else None
+            if not url:
+                log("⏹️ No more pages to scrape")
+
+        return reviews
+
+    def replay_reviews(self, source, company, start_date, end_date):
+        """Re-run the source's page parser over cached pages, without a browser"""
+        if source not in EXTRACTION_PLANS:
+            raise ValueError(f"Replay is not supported for {source}")
+
+        slug = re.sub(r'[^\w]+', '-', company.strip().lower()).strip('-')
+        pages = self.page_cache.pages(SOURCE_DOMAINS[source], slug)
+        log(f"⏪ Replaying {len(pages)} cached {source} pages matching '{slug}'")
+
+        planner = DateWindowPlanner(start_date, end_date)
+        reviews, seen = [], set()
+        for url, fetched_at, digest in pages:
+            html = self.page_cache.get(digest)
+            page_reviews = self.parse_page(source, html)[0] if html else None
+            for review in planner.filter(page_reviews or []):
+                # The same review shows up on every re-fetch of its page
+                fingerprint = review_fingerprint(review)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    reviews.append(review)
+
+        reviews.sort(key=review_sort_key, reverse=True)
+        log(f"🎉 Replay complete! Found {len(reviews)} reviews")
+        return reviews
+
+    def scrape_reviews(self, source, company, start_date, end_date):
+        """Main scraping method"""
+        self.last_error = None
+        self.last_plan = None
+        self.cut_short_by = None
+        self.reviews_seen = 0
+        if self.index:
+            self.index.start_run()
+        try:
+            if self.lean and self.driver:
+                self.lean.apply(self.driver, source)
+            elif self.capture and self.driver:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+
+            if source not in SOURCE_PLUGINS:
+                raise ValueError(f"Unsupported source: {source}")
+
+            # Search for product
+            product_url = self.search_product(source, company)
+            self.current_job = {'company': company, 'product_url': product_url, 'window': (start_date, end_date)}
+
+            reviews, complete = self.scrape_source(source, product_url, start_date, end_date)
+
+            if not complete:
+                # Keep the checkpoint so the next attempt resumes, and report the job as failed so it is retried
+                self.last_error = ConnectionError(f"Pagination cut short: {self.cut_short_by}")
+            elif self.store:
+                self.store.finish(source, product_url, (start_date, end_date))
+            self.metrics.finish_page()
+
+            log(f"\n🎉 Scraping complete! Found {self.reviews_seen} reviews", source=source, company=company,
+                reviews=self.reviews_seen)
+            self.metrics.report()
+            if self.waiter:
+                waits = self.waiter.summary()
+                log(f"⏱️  Waited {waits['total_wait_seconds']:.1f}s over {waits['pages']} pages "
+                    f"(avg {waits['avg_wait_seconds']:.2f}s/page)")
+            if self.last_plan:
+                plan = self.last_plan.report()
+                stopped = f", stopped early at page {plan['stopped_at']}" if plan['stopped_at'] else ""
+                log(f"⏩ Skipped {plan['pages_skipped']} pages before page {plan['first_page']}{stopped}")
+            if self.lean and self.driver:
+                lean = self.lean.totals
+                log(f"🪶 Lean browser: blocked {lean['blocked']} of {lean['requests']} requests, "
+                    f"~{lean['bytes_avoided_estimate'] / (1024 * 1024):.1f} MB avoided")
+            if self.capture and self.driver:
+                capture = self.capture.stats
+                log(f"📡 Captured {capture['reviews']} reviews from {capture['responses']} API responses "
+                    f"({capture['fallbacks']} pages fell back to HTML)")
+            if self.scoped and self.scoped.stats['pages']:
+                scoped = self.scoped.report()
+                log(f"✂️  Scoped extraction: {scoped['bytes'] / 1024:.0f} KB of review markup instead of "
+                    f"{scoped['full_page_bytes'] / 1024:.0f} KB of full pages over {scoped['pages']} pages "
+                    f"({scoped['saving']:.0%} less)", **scoped)
+            if self.index and self.index.stats['duplicates']:
+                dedup = self.index.stats
+                log(f"🧬 Dropped {dedup['duplicates']} duplicates ({dedup['repeated_in_run']} repeated across "
+                    f"pages, {dedup['from_earlier_runs']} from earlier runs; {dedup['disk_lookups']} disk lookups "
+                    f"for {dedup['checked']} reviews)")
+            if self.limiter:
+                for domain, pace in self.limiter.report().items():
+                    log(f"🚦 {domain}: {pace['requests']} requests, now {pace['rate']} req/s, "
+                        f"{pace['waited']}s paced, {pace['throttled']} throttled, "
+                        f"circuit opened {pace['circuit_opened']}x")
+            if self.http:
+                log(f"🌐 HTTP: {self.http.stats['requests']} requests over "
+                    f"{self.http.stats['connections']} connections")
+            return reviews
+
+        except Exception as e:
+            self.metrics.finish_page()
+            log(f"❌ Scraping failed: {e}", source=source, company=company)
+            self.last_error = e
+            return []
+
+
+# What --source all expands to
+SCRAPED_SOURCES = tuple(SOURCE_PLUGINS)
+
+
+def validate_inputs(company, start_date, end_date):
+    """Validate input parameters"""
+    errors = []
+
+    if not company or not company.strip():
+        errors.append("Company name cannot be empty")
+
+    try:
+        start_obj, end_obj = DATES.window(start_date, end_date)
+
+        if start_obj > end_obj:
+            errors.append("Start date must be before or equal to end date")
+
+        # Don't allow future dates
+        today = datetime.now().date()
+        if end_obj > today:
+            end_obj = today
+            log(f"⚠️  End date adjusted to today: {today}")
+
+    except ValueError:
+        errors.append("Dates must be in YYYY-MM-DD format")
+
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    return True
+
+
+def output_path(company, source, output_dir="output", suffix="", extension="json"):
+    """Timestamped output file path for a company/source"""
+    # Create output directory
+    Path(output_dir).mkdir(exist_ok=True)
+
+    # Clean company name for filename
+    safe_company = re.sub(r'[^\w\s-]', '', company).strip().replace(' ', '_')
+    filename = f"{safe_company}_{source}_reviews_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.{extension}"
+    return os.path.join(output_dir, filename)
+
+
+def save_reviews(reviews, company, source, output_dir="output", suffix=""):
+    """Save reviews to JSON file"""
+    if not reviews:
+        log("⚠️  No reviews to save")
+        return None
+
+    filepath = output_path(company, source, output_dir, suffix)
+
+    # Sort reviews by date (newest first)
+    if reviews:
+        reviews.sort(key=review_sort_key, reverse=True)
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump([review_dict(r) for r in reviews], f, indent=2, ensure_ascii=False)
+
+    log(f"💾 Reviews saved to: {filepath}")
+    return filepath
+
+
+def review_sort_key(review):
+    """Sort key for newest-first output; undated reviews sort last"""
+    return review_day(review) or date.min
+
+
+def iter_ndjson(path):
+    """Stream Review records from an NDJSON (or .ndjson.gz) file"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield Review.from_dict(json.loads(line))
+
+
+class ExternalSorter:
+    """Sorts a stream of reviews newest-first with bounded memory, using sorted runs on disk"""
+
+    def __init__(self, directory, run_size=10000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.run_size = run_size
+        self.runs = []
+        self._current = None
+        self._current_rows = 0
+
+    def add_page(self, reviews):
+        """Append a page to the current run on disk (flushed, so a crash keeps it)"""
+        if self._current is None:
+            path = self.directory / f"run{len(self.runs):05d}.ndjson"
+            self.runs.append(path)
+            self._current = open(path, 'w', encoding='utf-8')
+            self._current_rows = 0
+        for review in reviews:
+            self._current.write(json.dumps(review_dict(review), ensure_ascii=False) + '\n')
+        self._current.flush()
+        self._current_rows += len(reviews)
+        if self._current_rows >= self.run_size:
+            self._seal()
+
+    def _seal(self):
+        """Sort the current run in place; it holds at most run_size (+ one page) rows"""
+        if self._current is None:
+            return
+        self._current.close()
+        path = self.runs[-1]
+        with open(path, encoding='utf-8') as f:
+            rows = [Review.from_dict(json.loads(line)) for line in f]
+        rows.sort(key=review_sort_key, reverse=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row.to_dict(), ensure_ascii=False) + '\n')
+        self._current = None
+
+    def merged(self):
+        """k-way merge of all runs, newest first"""
+        self._seal()
+        return heapq.merge(*(iter_ndjson(path) for path in self.runs), key=review_sort_key, reverse=True)
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class NDJSONSink:
+    """Streaming newline-delimited JSON writer, optionally gzip-compressed and sorted by date at close"""
+
+    def __init__(self, path, sort_by_date=True, run_size=10000):
+        self.path = path
+        self.sort_by_date = sort_by_date
+        self.count = 0
+        if sort_by_date:
+            self.sorter = ExternalSorter(f"{path}.parts", run_size)
+        else:
+            self.sorter = None
+            self.file = self._open(path)
+
+    def _open(self, path):
+        if str(path).endswith('.gz'):
+            return gzip.open(path, 'wt', encoding='utf-8')
+        return open(path, 'w', encoding='utf-8')
 
-            print("✅ Chrome WebDriver initialized successfully!")
-            return True
+    def write_page(self, reviews):
+        """Write one page of reviews"""
+        self.count += len(reviews)
+        if self.sorter:
+            self.sorter.add_page(reviews)
+            return
+        for review in reviews:
+            self.file.write(json.dumps(review_dict(review), ensure_ascii=False) + '\n')
+        self.file.flush()
 
-        except Exception as e:
-            print(f"❌ Failed to initialize WebDriver: {e}")
-            return False
+    def close(self):
+        """Finish the file (merging sorted runs) and return its path"""
+        if self.sorter:
+            with self._open(self.path) as f:
+                for review in self.sorter.merged():
+                    f.write(json.dumps(review.to_dict(), ensure_ascii=False) + '\n')
+            self.sorter.cleanup()
+        else:
+            self.file.close()
+        return self.path
 
-    def close_driver(self):
-        """Close WebDriver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                print("🔒 WebDriver closed successfully!")
-            except:
-                pass
-            self.driver = None
 
-    def parse_date(self, date_str, source):
-        """Parse date string based on source format"""
-        if not date_str:
-            return None
+class ParquetSink:
+    """Streaming Parquet writer (pyarrow) that buffers row groups and sorts by date at close"""
 
-        date_str = date_str.strip()
+    COLUMNS = ('title', 'description', 'date', 'parsed_date', 'rating', 'reviewer', 'job_title',
+               'company_size', 'source')
+
+    def __init__(self, path, row_group_size=10000, sort_by_date=True):
         try:
-            if source == 'g2':
-                # G2 formats: 'Sep 15, 2025' or 'Sep 2025'
-                if re.match(r'\w{3}\s\d{1,2},?\s\d{4}', date_str):
-                    return datetime.strptime(date_str, '%b %d, %Y').date()
-                elif re.match(r'\w{3}\s\d{4}', date_str):
-                    return datetime.strptime(date_str, '%b %Y').date()
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = pyarrow.schema([(column, pyarrow.float64() if column == 'rating' else pyarrow.string())
+                                      for column in self.COLUMNS])
+        self.count = 0
+        self.sorter = ExternalSorter(f"{path}.parts", row_group_size) if sort_by_date else None
+        self.writer = None if sort_by_date else self.pq.ParquetWriter(path, self.schema, compression='zstd')
+        self.buffer = []
 
-            elif source == 'capterra':
-                # Capterra: 'September 15, 2025'
-                return datetime.strptime(date_str, '%B %d, %Y').date()
+    def _flush(self):
+        if self.buffer:
+            rows = [review_dict(r) for r in self.buffer]
+            columns = {c: [None if r.get(c) is None else str(r.get(c)) for r in rows] for c in self.COLUMNS}
+            columns['rating'] = [to_rating(r.get('rating')) for r in rows]
+            self.writer.write_table(self.pa.table(columns, schema=self.schema))
+            self.buffer = []
 
-            elif source == 'trustradius':
-                # TrustRadius: 'Sep 15, 2025'
-                return datetime.strptime(date_str, '%b %d, %Y').date()
+    def _append(self, review):
+        self.buffer.append(review)
+        if len(self.buffer) >= self.row_group_size:
+            self._flush()
 
-        except ValueError:
-            # Try alternative formats
-            for fmt in ['%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d']:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
+    def write_page(self, reviews):
+        """Write one page of reviews"""
+        self.count += len(reviews)
+        if self.sorter:
+            self.sorter.add_page(reviews)
+            return
+        for review in reviews:
+            self._append(review)
+
+    def close(self):
+        """Write the remaining row groups and return the path"""
+        if self.sorter:
+            self.writer = self.pq.ParquetWriter(self.path, self.schema, compression='zstd')
+            for review in self.sorter.merged():
+                self._append(review)
+        self._flush()
+        self.writer.close()
+        if self.sorter:
+            self.sorter.cleanup()
+        return self.path
+
+
+OUTPUT_FORMATS = {'json': 'json', 'ndjson': 'ndjson', 'ndjson.gz': 'ndjson.gz', 'parquet': 'parquet'}
+
+
+def open_sink(output_format, company, source, output_dir="output", suffix="", sort_by_date=True):
+    """Streaming sink for a non-JSON output format"""
+    path = output_path(company, source, output_dir, suffix, OUTPUT_FORMATS[output_format])
+    if output_format == 'parquet':
+        return ParquetSink(path, sort_by_date=sort_by_date)
+    return NDJSONSink(path, sort_by_date=sort_by_date)
+
+
+def finish_sink(scraper, source, company, start_date, end_date, page_size=1000):
+    """Close the scraper's sink (filling it from the store first, if any); returns (path, review count)"""
+    sink, scraper.sink = scraper.sink, None
+    if scraper.store:
+        # The store is the primary copy; stream its window into the sink in pages
+        page = []
+        for review in scraper.store.iter_reviews(source, company, start_date, end_date):
+            page.append(review)
+            if len(page) == page_size:
+                sink.write_page(page)
+                page = []
+        sink.write_page(page)
+    filepath = sink.close()
+    log(f"💾 Reviews streamed to: {filepath}")
+    return filepath, sink.count
+
+
+EXPORT_NAME = re.compile(r'^(?P<company>.+?)_(?P<sources>[a-z0-9+]+)_reviews_\d{8}_\d{6}')
+
+
+class ReviewColumns:
+    """
+    Review exports as NumPy columns, cached as .npy files that later runs memory-map instead of re-reading.
+
+    Dates are datetime64[D] (NaT when unknown) and ratings float32 (NaN when missing). Source, company,
+    company size and job title are dictionary-encoded int32 codes. select() builds a row mask and
+    group() aggregates the selected rows by one or more columns, or by month/year.
+    """
+
+    CATEGORIES = ('source', 'company', 'company_size', 'job_title')
+    EXPORT_PATTERNS = ('*_reviews_*.json', '*_reviews_*.ndjson', '*_reviews_*.ndjson.gz', '*_reviews_*.parquet')
+    VERSION = 2
+
+    def __init__(self, columns, dictionaries):
+        import numpy
+        self.np = numpy
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.codes = {name: {value: code for code, value in enumerate(values)}
+                      for name, values in dictionaries.items()}
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    @classmethod
+    def exports(cls, export_dir):
+        """Review export files in a directory, oldest name first"""
+        return sorted({p for pattern in cls.EXPORT_PATTERNS for p in Path(export_dir).glob(pattern)})
+
+    @staticmethod
+    def read_export(path):
+        """Yield the reviews of one export file as plain dicts"""
+        name = str(path)
+        if name.endswith('.parquet'):
+            try:
+                import pyarrow.parquet
+            except ImportError:
+                log(f"⚠️  Skipping {path}: reading Parquet needs pyarrow")
+                return
+            yield from pyarrow.parquet.read_table(path).to_pylist()
+        elif name.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                yield from json.load(f)
+        else:
+            opener = gzip.open if name.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    yield json.loads(line)
+
+    @classmethod
+    def build(cls, paths):
+        """Columns from export files, keeping one copy of reviews that several exports share"""
+        import numpy
+
+        days, ratings, seen = [], [], set()
+        categories = {name: [] for name in cls.CATEGORIES}
+        encoders = {name: {} for name in cls.CATEGORIES}
+        for path in paths:
+            match = EXPORT_NAME.match(Path(path).name)
+            company = match.group('company').replace('_', ' ') if match else ''
+            for review in cls.read_export(path):
+                day = str(review.get('parsed_date') or review.get('date') or '')[:10]
+                # Exports of overlapping windows repeat reviews; same identity as the store and index
+                fingerprint = review_fingerprint(review)
+                if fingerprint in seen:
                     continue
+                seen.add(fingerprint)
+                days.append(day)
+                rating = to_rating(review.get('rating'))
+                ratings.append(numpy.nan if rating is None else rating)
+                values = {'source': review.get('source') or '', 'company': company,
+                          'company_size': review.get('company_size') or '', 'job_title': review.get('job_title') or ''}
+                for name, value in values.items():
+                    encoder = encoders[name]
+                    categories[name].append(encoder.setdefault(value, len(encoder)))
 
-        print(f"⚠️  Could not parse date: '{date_str}' for {source}")
-        return None
+        try:
+            dates = numpy.array(days, dtype='datetime64[D]')
+        except ValueError:
+            # Some date is not ISO formatted (or is empty); convert one by one
+            dates = numpy.array([to_date(day) or 'NaT' for day in days], dtype='datetime64[D]')
+        columns = {'date': dates, 'rating': numpy.array(ratings, dtype=numpy.float32)}
+        for name in cls.CATEGORIES:
+            columns[name] = numpy.array(categories[name], dtype=numpy.int32)
+        return cls(columns, {name: list(encoder) for name, encoder in encoders.items()})
 
-    def search_product(self, source, company):
-        """Search for company and return product reviews URL"""
+    @classmethod
+    def open(cls, export_dir="output", cache_dir=None):
+        """Columns of every export in export_dir, memory-mapped from the cache while the exports are unchanged"""
+        import numpy
+
+        cache_dir = Path(cache_dir or Path(export_dir, 'review_columns'))
+        paths = cls.exports(export_dir)
+        signature = {str(p): [p.stat().st_size, p.stat().st_mtime_ns] for p in paths}
+        meta_path = cache_dir / 'meta.json'
         try:
-            print(f"🔍 Searching for '{company}' on {source}...")
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+        if meta and meta.get('version') == cls.VERSION and meta.get('exports') == signature:
+            columns = {name: numpy.load(cache_dir / f"{name}.npy", mmap_mode='r')
+                       for name in ('date', 'rating') + cls.CATEGORIES}
+            return cls(columns, meta['dictionaries'])
 
-            # Base search URLs
-            search_urls = {
-                'g2': f"https://www.g2.com/search?query={company.replace(' ', '%20')}",
-                'capterra': f"https://www.capterra.com/search?query={company.replace(' ', '%20')}",
-                'trustradius': f"https://www.trustradius.com/search?query={company.replace(' ', '%20')}"
-            }
+        started = time.perf_counter()
+        corpus = cls.build(paths)
+        corpus.save(cache_dir, signature)
+        log(f"🗃️  Indexed {len(corpus)} reviews from {len(paths)} exports in {time.perf_counter() - started:.1f}s")
+        return corpus
 
-            self.driver.get(search_urls[source])
-            time.sleep(3)
+    def save(self, cache_dir, signature):
+        """Write the columns as .npy files; meta.json goes last so a partial write is never loaded"""
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / 'meta.json').unlink(missing_ok=True)
+        for name, column in self.columns.items():
+            self.np.save(cache_dir / f"{name}.npy", column)
+        with open(cache_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'reviews': len(self), 'exports': signature,
+                       'dictionaries': self.dictionaries}, f)
 
-            # Source-specific product link selectors
-            selectors = {
-                'g2': "a[href*='/products/'][href*='/reviews']",
-                'capterra': "a[href*='/p/'][href*='/reviews/']",
-                'trustradius': "a[href*='/products/'][href*='/reviews']"
-            }
+    def select(self, start=None, end=None, source=None, company=None, company_size=None):
+        """Boolean mask of the reviews inside a date window and matching the given category values"""
+        np = self.np
+        mask = np.ones(len(self), dtype=bool)
+        if start:
+            mask &= self.columns['date'] >= np.datetime64(to_date(start), 'D')
+        if end:
+            mask &= self.columns['date'] <= np.datetime64(to_date(end), 'D')
+        for name, wanted in (('source', source), ('company', company), ('company_size', company_size)):
+            if wanted:
+                wanted = [wanted] if isinstance(wanted, str) else wanted
+                codes = [self.codes[name][value] for value in wanted if value in self.codes[name]]
+                mask &= np.isin(self.columns[name], codes)
+        return mask
 
-            link = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selectors[source])))
-            product_url = link.get_attribute('href')
+    def key(self, by):
+        """(group codes, labels) for one grouping column"""
+        np = self.np
+        if by in self.CATEGORIES:
+            return self.columns[by], self.dictionaries[by]
+        if by in ('month', 'year'):
+            periods = self.columns['date'].astype('datetime64[M]' if by == 'month' else 'datetime64[Y]')
+        elif by == 'rating':
+            periods = self.columns['rating']
+        else:
+            raise ValueError(f"Cannot group by '{by}'; use one of: "
+                             f"{', '.join(self.CATEGORIES + ('month', 'year', 'rating'))}")
+        values, codes = np.unique(periods, return_inverse=True)
+        if by == 'rating':
+            labels = [None if np.isnan(v) else float(v) for v in values]
+        else:
+            labels = [None if np.isnat(v) else str(v) for v in values]
+        return codes.astype(np.int64), labels
 
-            print(f"✅ Found product page: {product_url}")
-            return product_url
+    def group(self, by, mask=None):
+        """Review count, rated count and mean rating per group of the selected rows, as dicts"""
+        np = self.np
+        by = (by,) if isinstance(by, str) else tuple(by)
+        keys = [self.key(name) for name in by]
+        combined = np.zeros(len(self), dtype=np.int64)
+        for codes, labels in keys:
+            combined = combined * len(labels) + codes
+        ratings = self.columns['rating']
+        if mask is not None:
+            combined, ratings = combined[mask], ratings[mask]
 
-        except TimeoutException:
-            raise ValueError(f"❌ Could not find '{company}' on {source}. Check company name spelling.")
-        except Exception as e:
-            raise Exception(f"❌ Search failed: {e}")
+        groups, inverse = np.unique(combined, return_inverse=True)
+        rated = ~np.isnan(ratings)
+        counts = np.bincount(inverse, minlength=len(groups))
+        rated_counts = np.bincount(inverse, weights=rated, minlength=len(groups))
+        sums = np.bincount(inverse, weights=np.where(rated, ratings, 0.0), minlength=len(groups))
 
-    def scrape_g2_reviews(self, product_url, start_date, end_date):
-        """Scrape G2 reviews from a product URL using HTML parsing."""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        from bs4 import BeautifulSoup
-        import time
+        rows = []
+        for i, group in enumerate(groups.tolist()):
+            row = {}
+            for name, (_, labels) in reversed(list(zip(by, keys))):
+                group, code = divmod(group, len(labels))
+                row[name] = labels[code]
+            row = {name: row[name] for name in by}
+            row.update(reviews=int(counts[i]), rated=int(rated_counts[i]),
+                       mean_rating=round(float(sums[i] / rated_counts[i]), 3) if rated_counts[i] else None)
+            rows.append(row)
+        return rows
 
-        print(f"📄 Scraping G2 reviews from {product_url}")
-        self.driver.get(product_url)
-        time.sleep(3)
 
-        reviews = []
-        page_count = 0
+def parse_sources(value):
+    """--source value: one source, a comma-separated list, or 'all'"""
+    if value.strip().lower() == 'all':
+        return list(SCRAPED_SOURCES)
+    sources = []
+    for source in (s.strip().lower() for s in value.split(',')):
+        if source not in SOURCE_BACKENDS:
+            raise argparse.ArgumentTypeError(f"unknown source '{source}' (choose from {', '.join(SOURCE_BACKENDS)} or all)")
+        if source not in sources:
+            sources.append(source)
+    return sources
 
-        while True:
-            page_count += 1
-            print(f"📑 Processing G2 page {page_count}...")
 
-            # Wait for reviews to load
-            try:
-                self.wait.until(
-                    EC.presence_of_all_elements_located(
-                        (By.CSS_SELECTOR, "div.elv-flex.elv-flex-col.elv-gap-2.md\\:elv-gap-6")
-                    )
-                )
-            except TimeoutException:
-                print("⚠️ Timeout waiting for reviews to load")
-                break
+def scrape_sources(company, sources, start, end, chromedriver_path, output_format='json', output_dir="output",
+                   **batch_options):
+    """
+    Scrape several sources concurrently, one worker process and browser each, and merge them newest first.
 
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+    Each worker writes its source as a date-sorted NDJSON part; the parts are k-way merged into one output.
+    Returns (output path or None, review count, per-source batch results).
+    """
+    parts_dir = Path(output_dir) / f".sources_{os.getpid()}"
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [{'id': i, 'company': company, 'source': source, 'start': start, 'end': end, 'attempt': 0}
+            for i, source in enumerate(sources)]
+    started = time.perf_counter()
+    try:
+        results = run_batch(jobs, chromedriver_path, workers=len(jobs), output_dir=str(parts_dir),
+                            output_format='ndjson', **batch_options)
+        for r in results:
+            outcome = f"{r['result']['reviews']} reviews" if not r['error'] else f"failed ({r['error']})"
+            log(f"   {r['job']['source']}: {outcome}")
 
-            # review_elements = soup.select("div.elv-flex.elv-flex-col.elv-gap-2.md\\:elv-gap-6")
+        parts = [r['result']['output'] for r in results if not r['error'] and r['result']['output']]
+        merged = heapq.merge(*(iter_ndjson(path) for path in parts), key=review_sort_key, reverse=True)
+        label = 'all' if set(sources) == set(SCRAPED_SOURCES) else '+'.join(sources)
+        if output_format == 'json':
+            reviews = list(merged)
+            filepath, count = save_reviews(reviews, company, label, output_dir), len(reviews)
+        else:
+            # The merged stream is already in date order
+            sink = open_sink(output_format, company, label, output_dir, sort_by_date=False)
+            page = []
+            for review in merged:
+                page.append(review)
+                if len(page) == 1000:
+                    sink.write_page(page)
+                    page = []
+            sink.write_page(page)
+            filepath, count = sink.close(), sink.count
+            log(f"💾 Reviews streamed to: {filepath}")
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
 
-            review_elements = soup.find_all("div", attrs={"data-poison": True})
-            # for div in review_elements:
-            #     print(div)
+    log(f"⏱️  {len(sources)} sources in {time.perf_counter() - started:.1f}s")
+    return filepath, count, results
 
-            time.sleep(10)
 
-            if not review_elements:
-                print("⚠️  No review elements found on this page")
-                break
+def benchmark_parsers(directory, source, repeat=3):
+    """Compare review parse throughput of BeautifulSoup html.parser and the compiled lxml plans on saved pages"""
+    pages = [p.read_text(encoding='utf-8') for p in sorted(Path(directory).glob('*.html'))]
+    if not pages:
+        raise ValueError(f"No .html pages found in {directory}")
 
-            page_reviews = []
+    results = {}
+    outputs = {}
+    for parser in ('html.parser', 'lxml'):
+        scraper = ReviewScraper(None, parser=parser)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            parsed = [scraper.parse_page(source, html)[0] or [] for html in pages]
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        outputs[parser] = parsed
+        count = sum(len(p) for p in parsed)
+        results[parser] = {'pages': len(pages), 'reviews': count, 'seconds': round(best, 4),
+                           'reviews_per_second': round(count / best, 1) if best else None}
+        log(f"⏱️  {parser:<12} {count} reviews in {best:.3f}s ({results[parser]['reviews_per_second']} reviews/s)")
 
-            for elem in review_elements:
-                try:
-                    # Reviewer info
-                    reviewer_elem = elem.select_one('div[itemprop="author"] meta[itemprop="name"]')
-                    reviewer = reviewer_elem.get('content', 'Anonymous') if reviewer_elem else 'Anonymous'
+    results['identical_output'] = outputs['html.parser'] == outputs['lxml']
+    if results['html.parser']['seconds'] and results['lxml']['seconds']:
+        results['speedup'] = round(results['html.parser']['seconds'] / results['lxml']['seconds'], 2)
+        log(f"🚀 lxml plans are {results['speedup']}x faster; identical output: {results['identical_output']}")
+    return results
 
-                    job_elem = elem.select_one('div.elv-text-xs.elv-font-regular')
-                    job_title = job_elem.get_text(strip=True) if job_elem else ""
 
-                    company_size_elem = elem.select('div.elv-text-xs.elv-font-regular')
-                    company_size = company_size_elem[2].get_text(strip=True) if len(company_size_elem) > 2 else ""
+def benchmark_review_memory(count=100000):
+    """Compare memory per review of the old dict representation and Review records, with tracemalloc"""
+    import tracemalloc
 
-                    # Date
-                    date_elem = elem.select_one('meta[itemprop="datePublished"]')
-                    date_str = date_elem.get('content') if date_elem else None
-                    # review_date = self.parse_date(date_str, 'g2') if date_str else None
-                    review_date = date_str
+    job_titles = ['Software Engineer', 'Product Manager', 'Director of IT', 'Marketing Manager', 'CTO']
+    sizes = ['Small-Business(50 or fewer emp.)', 'Mid-Market(51-1000 emp.)', 'Enterprise(> 1000 emp.)']
 
+    def parsed_fields(i):
+        # Fresh string objects per review, as the parsers produce them
+        day = f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+        return {'title': f"Review title number {i}", 'text': f"Review body {i} " * 20, 'date': day,
+                'rating': f"{(i % 9) / 2 + 1:.1f}", 'reviewer': f"Reviewer {i % 5000}",
+                'job_title': ''.join(job_titles[i % len(job_titles)]), 'company_size': ''.join(sizes[i % len(sizes)])}
 
-                    # Rating
-                    rating_elem = elem.select_one('span[itemprop="reviewRating"] meta[itemprop="ratingValue"]')
-                    rating = rating_elem.get('content', '') if rating_elem else ""
+    def as_dict(f):
+        return {'title': f['title'], 'description': f['text'], 'date': f['date'], 'parsed_date': f['date'],
+                'rating': f['rating'], 'reviewer': f['reviewer'], 'job_title': f['job_title'],
+                'company_size': f['company_size'], 'source': ''.join('g2')}
 
-                    # Title
-                    title_elem = elem.select_one('div[itemprop="name"]')
-                    title = title_elem.get_text(strip=True) if title_elem else "No title"
+    def as_record(f):
+        return Review(f['title'], f['text'], f['date'], f['date'], f['rating'], f['reviewer'],
+                      f['job_title'], f['company_size'], ''.join('g2'))
 
-                    # Review text
-                    text_elem = elem.select_one('div[itemprop="reviewBody"]')
-                    text = text_elem.get_text(strip=True) if text_elem else ""
+    results = {}
+    for name, build in (('dict', as_dict), ('Review', as_record)):
+        tracemalloc.start()
+        records = [build(parsed_fields(i)) for i in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {'reviews': len(records), 'bytes_per_review': round(current / count, 1)}
+        log(f"🧮 {name:<7} {current / (1024 * 1024):.1f} MB for {count} reviews "
+            f"({current / count:.0f} bytes/review)")
+        del records
 
-                    start_date = datetime.strptime(str(start_date), "%Y-%m-%d").date()
-                    end_date = datetime.strptime(str(end_date), "%Y-%m-%d").date()
-                    current_date = datetime.strptime(str(date_str), "%Y-%m-%d").date()
+    results['saving'] = round(1 - results['Review']['bytes_per_review'] / results['dict']['bytes_per_review'], 3)
+    log(f"📉 Review records use {results['saving']:.0%} less memory per review")
+    return results
 
-                    # Check if current_date is within the range (inclusive)
-                    if start_date <= current_date <= end_date:
-                        print("✅ Date is within the given range")
-                    else:
-                        print("❌ Date is out of range")
-                        break
 
-                    review_data = {
-                        'title': title,
-                        'description': text,
-                        'date': date_str,
-                        'parsed_date': str(review_date) if review_date else None,
-                        'rating': rating,
-                        'reviewer': reviewer,
-                        'job_title': job_title,
-                        'company_size': company_size,
-                        'source': 'g2'
-                    }
-
-                    # Only add if meaningful content
-                    if title != "No title" and (text or rating):
-                        page_reviews.append(review_data)
-                except Exception as e:
-                    print(f"⚠️  Error parsing G2 review: {e}")
-                    continue
+def write_benchmark_fixtures(directory, company='Acme', pages=40, per_page=10, newest='2025-01-01'):
+    """Write a paginated G2 listing (with its search page) and TrustRadius pages for FixtureServer to serve"""
+    directory = Path(directory)
+    slug = re.sub(r'[^a-z0-9]+', '-', company.lower()).strip('-')
+    listing = f"/products/{slug}/reviews"
+    sizes = ['Small-Business(50 or fewer emp.)', 'Mid-Market(51-1000 emp.)', 'Enterprise(> 1000 emp.)']
+    day = to_date(newest)
 
-            reviews.extend(page_reviews)
-            print(f"✅ Found {len(page_reviews)} reviews on this page (Total: {len(reviews)})")
+    g2_dir, tr_dir = directory / 'g2', directory / 'trustradius'
+    g2_dir.mkdir(parents=True, exist_ok=True)
+    tr_dir.mkdir(parents=True, exist_ok=True)
+    (g2_dir / fixture_name(f"/search?query={company.replace(' ', '%20')}")).write_text(
+        f'<html><body><a href="{listing}">{company}</a></body></html>', encoding='utf-8')
+
+    for page in range(1, pages + 1):
+        g2_cards, tr_cards = [], []
+        for i in range(per_page):
+            n = (page - 1) * per_page + i
+            body = f"Review {n} of {company}. " + "It does what we need and support answers quickly. " * (3 + n % 8)
+            rating = f"{(n % 9) / 2 + 1:.1f}"
+            g2_cards.append(
+                f'<div data-poison="1"><div itemprop="author"><meta itemprop="name" content="Reviewer {n}"></div>'
+                f'<div class="elv-text-xs elv-font-regular">Engineer {n % 7}</div>'
+                f'<div class="elv-text-xs elv-font-regular">Software</div>'
+                f'<div class="elv-text-xs elv-font-regular">{sizes[n % 3]}</div>'
+                f'<meta itemprop="datePublished" content="{day.isoformat()}">'
+                f'<span itemprop="reviewRating"><meta itemprop="ratingValue" content="{rating}"></span>'
+                f'<div itemprop="name">Title {n}</div><div itemprop="reviewBody">{body}</div></div>')
+            tr_cards.append(
+                f'<div class="reviewCard"><span class="reviewCard__reviewerName">Reviewer {n}</span>'
+                f'<span class="reviewCard__reviewerRole">Engineer {n % 7}</span>'
+                f'<span class="reviewCard__reviewDate">{day.strftime("%B %d, %Y")}</span>'
+                f'<meta itemprop="ratingValue" content="{rating}">'
+                f'<h3 class="reviewCard__title">Title {n}</h3><div class="reviewCard__body">{body}</div></div>')
+            day -= timedelta(days=3)
+
+        last = page == pages
+        g2_next = '' if last else f'<ul class="pagination"><li><a href="{listing}?page={page + 1}">Next ›</a></li></ul>'
+        tr_next = '' if last else f'<a aria-label="Next Page" href="{listing}?page={page + 1}">Next</a>'
+        url = page_url(listing, page) if page > 1 else listing
+        (g2_dir / fixture_name(url)).write_text(
+            '<html><body>' + ''.join(g2_cards) + g2_next + '</body></html>', encoding='utf-8')
+        (tr_dir / fixture_name(url)).write_text(
+            '<html><body>' + ''.join(tr_cards) + tr_next + '</body></html>', encoding='utf-8')
+
+    return {'company': company, 'start': day + timedelta(days=3), 'end': to_date(newest),
+            'pages': pages, 'reviews': pages * per_page}
+
+
+def benchmark_dates(count=20000):
+    """Time the date handling of each source (display formats, ISO dates and fallbacks), in microseconds per call"""
+    scraper = ReviewScraper(None)
+    samples = {
+        'g2': ['2025-09-15'],
+        'trustradius': ['September 15, 2025', 'Sep 15, 2025', '2025-09-15'],
+        'capterra': ['September 15, 2025'],
+    }
+    results = {}
+    for source, values in samples.items():
+        started = time.perf_counter()
+        for i in range(count):
+            scraper.parse_date(values[i % len(values)], source)
+        results[f"parse_date.{source}"] = round((time.perf_counter() - started) / count * 1e6, 2)
 
-            #  Pagination: click Next button
+    # Every string new to the cache: the cost of format detection and parsing itself
+    uncached = DateNormalizer(max_entries=0)
+    started = time.perf_counter()
+    for i in range(count):
+        uncached.parse(f"September {i % 28 + 1}, {2000 + i % 25}", 'trustradius')
+    results['parse_date.uncached'] = round((time.perf_counter() - started) / count * 1e6, 2)
+
+    page = [f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}" for i in range(10)]
+    started = time.perf_counter()
+    for i in range(count // len(page)):
+        DATES.parse_many(page, 'g2')
+    results['parse_many.g2_page'] = round((time.perf_counter() - started) / count * 1e6, 2)
+
+    started = time.perf_counter()
+    for i in range(count):
+        to_date(f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+    results['to_date'] = round((time.perf_counter() - started) / count * 1e6, 2)
+
+    started = time.perf_counter()
+    for i in range(count):
+        scraper.build_review('trustradius', {'date': 'September 15, 2025', 'title': 'T', 'text': 'B', 'rating': '4.5'})
+    results['build_review.trustradius'] = round((time.perf_counter() - started) / count * 1e6, 2)
+
+    for name, micros in results.items():
+        log(f"⏱️  {name:<26} {micros} µs/call")
+    report = DATES.report()
+    log(f"🗓️  Date cache: {report['cached']} strings, {report['hits']} hits, {report['misses']} misses")
+    return results
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of a process and all its descendants in MB, or None where it cannot be read"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
             try:
-                pagination_links = self.driver.find_elements(By.CSS_SELECTOR, "ul.pagination a")
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue  # exited meanwhile
+        return round(total / (1024 * 1024), 1)
 
-                next_button = None
-                for link in pagination_links:
-                    if "Next" in link.text:  # Look for text "Next ›"
-                        next_button = link
-                        break
+    # Without psutil, Linux still exposes the process tree under /proc
+    proc = Path('/proc')
+    if not (proc / str(pid)).is_dir():
+        return None
+    children = {}
+    for stat in proc.glob('[0-9]*/stat'):
+        try:
+            # The command name may contain spaces and parentheses; the parent pid follows the last ')'
+            parent = int(stat.read_text().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(stat.parent.name))
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, ()))
+        try:
+            total += int((proc / str(current) / 'statm').read_text().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, IndexError, ValueError):
+            continue
+    return round(total / (1024 * 1024), 1)
 
-                if next_button and next_button.is_displayed():
-                    print("🔄 Clicking Next page...")
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(4)  # wait for page to load
-                else:
-                    print("⏹️ No more pages to scrape")
-                    break
-            except NoSuchElementException:
-                print("⏹️  Next page button not found - end of reviews")
-                break
 
-        return reviews
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
 
-    def scrape_trustradius_reviews(self, product_name, start_date, end_date):
-        """Search for a product on TrustRadius and scrape its reviews within a date range."""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        from bs4 import BeautifulSoup
-        from datetime import datetime
-        import time
-
-        def open_product_page(name):
-            """Search product and open the first suggestion."""
-            print(f"🔍 Searching for product: {name}")
-            self.driver.get("https://www.trustradius.com/")
-            search_box = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Search']"))
-            )
-            time.sleep(4)
-            search_box.clear()
-            search_box.send_keys(name)
-            time.sleep(5)
 
+def benchmark_scrape(directory, company, start_date, end_date, latency=0.05):
+    """
+    Scrape G2 pages from a local FixtureServer over the HTTP backend and report throughput and stage time.
+
+    The scrape runs in its own process, so its peak RSS excludes the parse benchmarks run before it.
+    """
+    result_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=benchmark_scrape_worker,
+                                      args=(result_queue, str(directory), company, start_date, end_date, latency))
+    process.start()
+    try:
+        while True:
             try:
-                first_result = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.autocomplete__list li a"))
-                )
-                time.sleep(2)
-                product_url = first_result.get_attribute("href")
-                first_result.click()
-                time.sleep(4)
-                print(f"✅ Opened product page: {product_url}")
-                time.sleep(3)
-                return product_url
-            except Exception as e:
-                print(f"⚠️ Could not open product: {e}")
-                return None
+                results = result_queue.get(timeout=1)
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    raise RuntimeError(f"Benchmark scrape exited with code {process.exitcode}")
+    finally:
+        process.join()
+    log(f"🏁 {results['pages']} pages, {results['reviews']} reviews in {results['seconds']:.2f}s "
+        f"({results['pages_per_second']} pages/s, {results['reviews_per_second']} reviews/s, "
+        f"peak RSS {results['peak_rss_mb']} MB)")
+    return results
+
+
+def benchmark_scrape_worker(result_queue, directory, company, start_date, end_date, latency):
+    """Worker process of benchmark_scrape"""
+    with FixtureServer(str(directory), latency=latency) as server:
+        scraper = ReviewScraper(None, 'http', {'origin': server.url})
+        scraper.limiter = None
+        try:
+            started = time.perf_counter()
+            reviews = scraper.scrape_reviews('g2', company, start_date, end_date)
+            elapsed = time.perf_counter() - started
+        finally:
+            scraper.close_driver()
+
+    pages = scraper.metrics.counters.get('pages', 0)
+    results = {'pages': pages, 'reviews': len(reviews), 'seconds': round(elapsed, 3), 'latency': latency,
+               'pages_per_second': round(pages / elapsed, 2) if elapsed else None,
+               'reviews_per_second': round(len(reviews) / elapsed, 1) if elapsed else None,
+               'peak_rss_mb': peak_rss_mb(), 'stages': scraper.metrics.summary()}
+    result_queue.put(results)
+
+
+BENCHMARK_KEYS = (
+    ('parse.g2.lxml.reviews_per_second', True),
+    ('parse.trustradius.lxml.reviews_per_second', True),
+    ('scrape.pages_per_second', True),
+    ('scrape.reviews_per_second', True),
+    ('scrape.peak_rss_mb', False),
+)
+
+
+def benchmark_value(results, key):
+    for part in key.split('.'):
+        if not isinstance(results, dict) or part not in results:
+            return None
+        results = results[part]
+    return results
+
+
+def git_commit():
+    """Short hash of the checked-out commit, with '+' when the tree has local changes, or None outside git"""
+    import subprocess
+
+    cwd = Path(__file__).resolve().parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('+' if dirty else '')
+
+
+def compare_benchmarks(previous, current):
+    """Log the change of the headline numbers against an earlier result; returns {key: relative change}"""
+    changes = {}
+    keys = BENCHMARK_KEYS + tuple((f"dates.{name}", False) for name in current.get('dates', {}))
+    for key, higher_is_better in keys:
+        before, after = benchmark_value(previous, key), benchmark_value(current, key)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        changes[key] = round(change, 3)
+        better = change > 0 if higher_is_better else change < 0
+        mark = '🟢' if abs(change) < 0.05 else ('📈' if better else '📉')
+        log(f"{mark} {key:<42} {before} -> {after} ({change:+.1%})")
+    return changes
+
+
+def run_benchmarks(results_dir="output/benchmarks", fixtures=None, company=None, start_date=None, end_date=None,
+                   latency=0.05, baseline=None):
+    """
+    Run the offline benchmark suite and save the result as JSON for comparison across commits.
+
+    Without recorded fixtures (pages saved with --record-dir, served back under their URLs) a
+    generated G2/TrustRadius listing is used. The result is compared with `baseline`, or with
+    the latest earlier result in results_dir.
+    """
+    import platform
+    import tempfile
+
+    results_dir = Path(results_dir)
+    previous = sorted(results_dir.glob('*.json'))
+    baseline = Path(baseline) if baseline else (previous[-1] if previous else None)
 
-        def parse_review(elem):
-            """Extract review details from a BeautifulSoup element."""
+    with tempfile.TemporaryDirectory(prefix='review_bench_') as generated:
+        if fixtures:
+            g2_dir = tr_dir = Path(fixtures)
+            if not (company and start_date and end_date):
+                raise ValueError("Recorded fixtures need --company, --start and --end")
+        else:
+            listing = write_benchmark_fixtures(generated)
+            g2_dir, tr_dir = Path(generated, 'g2'), Path(generated, 'trustradius')
+            company, start_date, end_date = listing['company'], listing['start'], listing['end']
+
+        log("🧪 Parsing...")
+        parse = {'g2': benchmark_parsers(g2_dir, 'g2')}
+        if any(tr_dir.glob('*.html')):
+            parse['trustradius'] = benchmark_parsers(tr_dir, 'trustradius')
+        log("🧪 Dates...")
+        dates = benchmark_dates()
+        log(f"🧪 End to end ({latency * 1000:.0f} ms latency)...")
+        scrape = benchmark_scrape(g2_dir, company, start_date, end_date, latency)
+
+    commit = git_commit()
+    results = {'commit': commit, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+               'python': platform.python_version(), 'platform': platform.platform(),
+               'fixtures': str(fixtures) if fixtures else 'generated',
+               'parse': parse, 'dates': dates, 'scrape': scrape}
+
+    if baseline and baseline.is_file():
+        log(f"🔍 Compared with {baseline.name}:")
+        with open(baseline, encoding='utf-8') as f:
+            results['changes'] = compare_benchmarks(json.load(f), results)
+        results['baseline'] = baseline.name
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{(commit or 'nogit').replace('+', '-dirty')}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, default=str)
+    log(f"💾 Benchmark results saved to {path}")
+    return results
+
+
+def load_jobs(jobs_file):
+    """Load batch jobs from a CSV file with company,source,start,end columns"""
+    jobs = []
+    with open(jobs_file, newline='', encoding='utf-8') as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
             try:
-                reviewer = elem.select_one("span.reviewCard__reviewerName")
-                reviewer = reviewer.get_text(strip=True) if reviewer else "Anonymous"
+                if row.get('source') not in SOURCE_PLUGINS:
+                    raise ValueError(f"Unsupported source: {row.get('source')}")
+                validate_inputs(row.get('company', ''), row.get('start', ''), row.get('end', ''))
+            except ValueError as e:
+                log(f"⚠️  Skipping job on line {line_no}: {e}")
+                continue
+            jobs.append({'id': len(jobs), 'company': row['company'], 'source': row['source'],
+                         'start': row['start'], 'end': row['end'], 'attempt': 0})
+    return jobs
 
-                job_title = elem.select_one("span.reviewCard__reviewerRole")
-                job_title = job_title.get_text(strip=True) if job_title else ""
 
-                date_elem = elem.select_one("span.reviewCard__reviewDate")
-                date_str = date_elem.get_text(strip=True) if date_elem else None
-                review_date = None
-                if date_str:
-                    try:
-                        review_date = datetime.strptime(date_str, "%B %d, %Y").date()
-                    except:
-                        pass
-
-                rating_elem = elem.select_one("meta[itemprop='ratingValue']")
-                rating = rating_elem.get("content") if rating_elem else ""
-
-                title_elem = elem.select_one("h3.reviewCard__title")
-                title = title_elem.get_text(strip=True) if title_elem else "No title"
-
-                text_elem = elem.select_one("div.reviewCard__body")
-                text = text_elem.get_text(strip=True) if text_elem else ""
-
-                # Date filter
-                if review_date:
-                    start_date_obj = datetime.strptime(str(start_date), "%Y-%m-%d").date()
-                    end_date_obj = datetime.strptime(str(end_date), "%Y-%m-%d").date()
-                    if not (start_date_obj <= review_date <= end_date_obj):
-                        print(f"❌ Skipping review ({date_str}) - out of range")
-                        return None
-                    print("✅ Date is within range")
-
-                return {
-                    "title": title,
-                    "description": text,
-                    "date": str(review_date) if review_date else date_str,
-                    "rating": rating,
-                    "reviewer": reviewer,
-                    "job_title": job_title,
-                    "source": "trustradius",
-                }
-            except Exception as e:
-                print(f"⚠️ Error parsing review: {e}")
-                return None
+def worker_scraper(chromedriver_path, backend='selenium', db_path=None, cache_dir=None, cache_max_bytes=None,
+                   lean_types=None, index_path=None, prefetch=1, rate_limit=None, search_cache_path=None,
+                   search_ttl_days=30, scoped=False, capture_xhr=False, parser='auto', full_refresh=False,
+                   record_dir=None):
+    """ReviewScraper set up the same way for batch workers and daemon sessions"""
+    http_options = {'record_dir': record_dir} if record_dir else None
+    scraper = ReviewScraper(chromedriver_path, backend, http_options, parser)
+    scraper.prefetch = prefetch
+    if scoped:
+        scraper.scoped = ScopedCapture()
+    if capture_xhr:
+        scraper.capture = NetworkCapture()
+    if rate_limit is not None:
+        # A dict of RateLimiter settings, or False for no rate limiting
+        scraper.limiter = RateLimiter(**rate_limit) if rate_limit else None
+    if lean_types is not None:
+        scraper.lean = LeanBrowser(lean_types)
+    if db_path:
+        scraper.store = ReviewStore(db_path)
+        scraper.incremental = not full_refresh
+    if cache_dir:
+        scraper.page_cache = PageCache(cache_dir, cache_max_bytes)
+    if index_path:
+        scraper.index = ReviewIndex(index_path)
+    if search_cache_path:
+        scraper.search_cache = SearchCache(search_cache_path, search_ttl_days)
+    return scraper
 
-        # STEP 1: Open product page
-        product_url = open_product_page(product_name)
-        if not product_url:
-            return []
 
-        reviews, page_count = [], 0
+def close_worker_scraper(scraper):
+    """Close the browser and every store a worker_scraper() opened"""
+    scraper.close_driver()
+    if scraper.store:
+        scraper.store.close()
+    if scraper.page_cache:
+        scraper.page_cache.close()
+    if scraper.index:
+        scraper.index.close()
+    if scraper.search_cache:
+        scraper.search_cache.close()
+
+
+def run_job(scraper, job, output_dir, output_format='json', metrics_dir=None):
+    """Scrape one job on a reusable scraper and save its output: (result, None) or (None, error message)"""
+    start_date, end_date = DATES.window(job['start'], job['end'])
+    suffix = f"_{job['start']}_{job['end']}_job{job['id']}"
+    if output_format != 'json':
+        scraper.sink = open_sink(output_format, job['company'], job['source'], output_dir, suffix)
+    scraper.metrics.reset()
+    reviews = scraper.scrape_reviews(job['source'], job['company'], start_date, end_date)
+    if metrics_dir:
+        name = f"job{job['id']}_{job['source']}_attempt{job['attempt'] + 1}"
+        scraper.metrics.export(Path(metrics_dir, f"{name}.trace.json"), Path(metrics_dir, f"{name}.prom"))
+
+    if scraper.last_error:
+        scraper.sink = None
+        # The session may be broken; start the next job on a fresh browser
+        scraper.close_driver()
+        return None, str(scraper.last_error)
+
+    with scraper.metrics.stage('save'):
+        if scraper.sink:
+            filepath, count = finish_sink(scraper, job['source'], job['company'], start_date, end_date)
+        else:
+            if scraper.store:
+                reviews = scraper.store.reviews(job['source'], job['company'], start_date, end_date)
+            filepath, count = (save_reviews(reviews, job['company'], job['source'], output_dir, suffix),
+                               len(reviews))
+            scraper.mark_saved()
+    return {'reviews': count, 'output': filepath}, None
+
+
+def recycle_browser(scraper, name, recycle_pages, recycle_memory_mb):
+    """Close the browser once it has served recycle_pages pages or grown past recycle_memory_mb; True if it did"""
+    memory = scraper.browser_memory_mb()
+    if scraper.pages_scraped() >= recycle_pages or (memory and memory >= recycle_memory_mb):
+        log(f"♻️  {name}: recycling WebDriver after {scraper.pages_scraped()} pages"
+            f"{f' / {memory:.0f} MB' if memory else ''}")
+        scraper.close_driver()
+        return True
+    return False
 
-        # STEP 2: Scrape reviews across pages
+
+def batch_worker(worker_id, chromedriver_path, job_queue, result_queue, current_jobs,
+                 recycle_pages, recycle_memory_mb, output_dir, backend='selenium', db_path=None,
+                 cache_dir=None, cache_max_bytes=None, lean_types=None, output_format='json', index_path=None,
+                 prefetch=1, rate_limit=None, search_cache_path=None, search_ttl_days=30,
+                 log_format='text', metrics_dir=None, scoped=False, capture_xhr=False, parser='auto',
+                 full_refresh=False, record_dir=None):
+    """
+    Worker process: run jobs from the queue on one reusable WebDriver.
+
+    current_jobs[worker_id] holds the id of the job in hand (-1 when idle), so the parent can retry
+    it if this process dies.
+    """
+    configure_logging(log_format)
+    scraper = worker_scraper(chromedriver_path, backend, db_path, cache_dir, cache_max_bytes, lean_types,
+                             index_path, prefetch, rate_limit, search_cache_path, search_ttl_days, scoped,
+                             capture_xhr, parser, full_refresh, record_dir)
+    try:
         while True:
-            page_count += 1
-            print(f"📑 Processing TrustRadius page {page_count}...")
+            job = job_queue.get()
+            if job is None:
+                break
+            current_jobs[worker_id] = job['id']
+
+            if scraper.needs_browser(job['source']) and not scraper.driver and not scraper.setup_driver():
+                result_queue.put((job, None, "Failed to setup WebDriver"))
+                current_jobs[worker_id] = -1
+                continue
 
+            log(f"👷 Worker {worker_id}: {job['company']} on {job['source']} (attempt {job['attempt'] + 1})",
+                worker=worker_id, job=job['id'], company=job['company'], source=job['source'])
             try:
-                self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.reviewCard")))
-            except TimeoutException:
-                print("⚠️ Timeout waiting for reviews")
-                break
+                result, error = run_job(scraper, job, output_dir, output_format, metrics_dir)
+            except Exception as e:
+                # e.g. a sink without its optional dependency, or a failed save; the job is retried
+                scraper.sink = None
+                result, error = None, str(e) or type(e).__name__
+            result_queue.put((job, result, error))
+            current_jobs[worker_id] = -1
+            if not error:
+                # Recycle the browser before it gets slow or bloated
+                recycle_browser(scraper, f"Worker {worker_id}", recycle_pages, recycle_memory_mb)
+    finally:
+        close_worker_scraper(scraper)
 
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            review_elements = soup.select("div.reviewCard")
 
-            if not review_elements:
-                print("⚠️ No reviews found on this page")
-                break
+def run_batch(jobs, chromedriver_path, workers=None, recycle_pages=200, recycle_memory_mb=2048,
+              max_attempts=3, output_dir="output", backend='selenium', db_path=None,
+              cache_dir=None, cache_max_bytes=1024 * 1024 * 1024, lean_types=None, output_format='json',
+              index_path=None, prefetch=1, rate_limit=None, search_cache_path=None, search_ttl_days=30,
+              log_format='text', metrics_dir=None, scoped=False, capture_xhr=False, parser='auto',
+              full_refresh=False, record_dir=None):
+    """Run jobs over a bounded pool of worker processes, each owning one WebDriver"""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    job_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    current_jobs = multiprocessing.Array('i', [-1] * workers, lock=False)
+    for job in jobs:
+        job_queue.put(job)
 
-            page_reviews = []
-            for elem in review_elements:
-                review = parse_review(elem)
-                if review:
-                    page_reviews.append(review)
+    def start_worker(i):
+        current_jobs[i] = -1
+        process = multiprocessing.Process(target=batch_worker,
+                                          args=(i, chromedriver_path, job_queue, result_queue, current_jobs,
+                                                recycle_pages, recycle_memory_mb, output_dir, backend, db_path,
+                                                cache_dir, cache_max_bytes, lean_types, output_format, index_path,
+                                                prefetch, rate_limit, search_cache_path, search_ttl_days,
+                                                log_format, metrics_dir, scoped, capture_xhr, parser,
+                                                full_refresh, record_dir))
+        process.start()
+        return process
 
-            reviews.extend(page_reviews)
-            print(f"✅ Found {len(page_reviews)} reviews (Total: {len(reviews)})")
+    processes = {i: start_worker(i) for i in range(workers)}
+    log(f"🏭 Running {len(jobs)} jobs on {workers} workers")
+    results, pending = [], len(jobs)
+    latest = {job['id']: job for job in jobs}
+    settled = set()
+
+    def settle(job, result, error):
+        nonlocal pending
+        # A worker that died right after reporting its job must not settle it twice
+        if (job['id'], job['attempt']) in settled:
+            return
+        settled.add((job['id'], job['attempt']))
+        latest[job['id']] = job
+        if error:
+            job['attempt'] += 1
+            if job['attempt'] < max_attempts:
+                log(f"🔁 Re-queueing {job['company']} on {job['source']}: {error}")
+                job_queue.put(job)
+                return
+            log(f"❌ Giving up on {job['company']} on {job['source']} after {job['attempt']} attempts")
+        pending -= 1
+        results.append({'job': job, 'result': result, 'error': error})
 
-            # STEP 3: Pagination
+    try:
+        while pending:
             try:
-                next_button = self.driver.find_element(By.CSS_SELECTOR, "a[aria-label='Next Page']")
-                if next_button and next_button.is_displayed():
-                    print("🔄 Clicking Next page...")
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(4)
-                else:
-                    print("⏹️ No more pages")
+                job, result, error = result_queue.get(timeout=1)
+            except queue.Empty:
+                # Nothing reported: make sure no worker died with a job in hand
+                for i, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    del processes[i]
+                    job_id = current_jobs[i]
+                    log(f"💥 Worker {i} exited with code {process.exitcode}")
+                    if job_id >= 0:
+                        processes[i] = start_worker(i)
+                        settle(dict(latest[job_id]), None, f"Worker {i} exited with code {process.exitcode}")
+                if not processes:
+                    # Every worker died before taking a job (e.g. a broken setup): fail what is left
+                    while pending:
+                        try:
+                            job = job_queue.get(timeout=1)
+                        except queue.Empty:
+                            break
+                        job['attempt'] = max(job['attempt'], max_attempts - 1)
+                        settle(job, None, "No worker left to run the job")
                     break
-            except NoSuchElementException:
-                print("⏹️ Next page button not found - end of reviews")
-                break
+                continue
+            settle(job, result, error)
+    finally:
+        for _ in processes:
+            job_queue.put(None)
+        for process in processes.values():
+            process.join()
 
-        return reviews
+    succeeded = sum(1 for r in results if not r['error'])
+    log(f"\n📊 BATCH SUMMARY: {succeeded}/{len(jobs)} jobs succeeded")
+    return results
 
-    def scrape_reviews(self, source, company, start_date, end_date):
-        """Main scraping method"""
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Job API of a ScraperDaemon: POST /jobs, GET /jobs, /jobs/<id>, /jobs/<id>/reviews and /health"""
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') != '/jobs':
+            self.send_error(404)
+            return
         try:
-            # Search for product
-            product_url = self.search_product(source, company)
+            length = int(self.headers.get('Content-Length') or 0)
+            job = self.server.scraper_daemon.submit(json.loads(self.rfile.read(length) or b'{}'))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        self.send_json(202, job)
 
-            # Source-specific scraping
-            if source == 'g2':
-                reviews = self.scrape_g2_reviews(product_url, start_date, end_date)
-            elif source == 'capterra':
-                reviews = self.scrape_capterra_reviews(product_url, start_date, end_date)
-            elif source == 'trustradius':
-                reviews = self.scrape_trustradius_reviews(product_url, start_date, end_date)
+    def do_GET(self):
+        daemon = self.server.scraper_daemon
+        parts = [p for p in urlparse(self.path).path.split('/') if p]
+        if parts == ['health']:
+            self.send_json(200, daemon.health())
+        elif parts == ['jobs']:
+            self.send_json(200, daemon.status())
+        elif len(parts) in (2, 3) and parts[0] == 'jobs' and parts[2:] in ([], ['reviews']):
+            job = daemon.status(parts[1])
+            if job is None:
+                self.send_json(404, {'error': f"No job {parts[1]}"})
+            elif len(parts) == 2:
+                self.send_json(200, job)
             else:
-                raise ValueError(f"Unsupported source: {source}")
+                self.stream_reviews(parts[1])
+        else:
+            self.send_error(404)
 
-            print(f"\n🎉 Scraping complete! Found {len(reviews)} reviews")
-            return reviews
+    def stream_reviews(self, job_id):
+        """Send a job's reviews as NDJSON as its pages are scraped; the response ends when the job does"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        try:
+            for batch in self.server.scraper_daemon.follow(job_id):
+                self.wfile.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in batch).encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
 
-        except Exception as e:
-            print(f"❌ Scraping failed: {e}")
-            return []
+    def log_message(self, format, *args):
+        pass
 
 
-def validate_inputs(company, start_date, end_date):
-    """Validate input parameters"""
-    errors = []
+class ScraperDaemon:
+    """
+    Long-lived scraper taking jobs over a local HTTP or Unix-socket API.
 
-    if not company or not company.strip():
-        errors.append("Company name cannot be empty")
+    Each session thread owns one ReviewScraper whose Chrome is started up front and kept open
+    between jobs, so cookies and the warm browser carry over and a job costs only its page work.
+    Jobs are saved like batch jobs; their reviews can also be streamed while they run.
+    """
 
-    try:
-        start_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+    FINISHED = ('done', 'failed')
 
-        if start_obj > end_obj:
-            errors.append("Start date must be before or equal to end date")
+    def __init__(self, chromedriver_path, sessions=2, output_dir="output", output_format='json', max_attempts=3,
+                 recycle_pages=200, recycle_memory_mb=2048, metrics_dir=None, keep_jobs=200, **scraper_options):
+        self.chromedriver_path = chromedriver_path
+        self.sessions = sessions
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.max_attempts = max_attempts
+        self.recycle_pages = recycle_pages
+        self.recycle_memory_mb = recycle_memory_mb
+        self.metrics_dir = metrics_dir
+        self.keep_jobs = keep_jobs
+        self.scraper_options = scraper_options
+        self.queue = queue.Queue()
+        self.changed = threading.Condition()
+        self.jobs = {}      # id -> job, in submission order
+        self.streams = {}   # id -> review dicts scraped so far
+        self.streamed = {}  # id -> fingerprints already streamed (retries re-scrape pages)
+        self.next_id = 1
+        self.threads = []
+        self.server = None
+        self.socket_path = None
+        self.warm = 0
 
-        # Don't allow future dates
-        today = datetime.now().date()
-        if end_obj > today:
-            end_obj = today
-            print(f"⚠️  End date adjusted to today: {today}")
+    def start(self, address):
+        """Start the sessions and listen on address: a port, host:port, or a Unix socket path"""
+        for number in range(1, self.sessions + 1):
+            thread = threading.Thread(target=self.session, args=(number,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
 
-    except ValueError:
-        errors.append("Dates must be in YYYY-MM-DD format")
+        address = str(address)
+        if address.isdigit() or ':' in address:
+            host, _, port = address.rpartition(':')
+            self.server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), DaemonRequestHandler)
+            where = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        else:
+            import socketserver
+            if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+                raise ValueError("Unix sockets are not available on this platform - pass a port instead")
+            Path(address).unlink(missing_ok=True)
+            self.server = socketserver.ThreadingUnixStreamServer(address, DaemonRequestHandler)
+            self.server.daemon_threads = True
+            self.socket_path = address
+            where = f"unix:{address}"
+        self.server.scraper_daemon = self
+        log(f"🛰️  Daemon listening on {where} with {self.sessions} browser sessions", address=where)
+        return where
 
-    if errors:
-        raise ValueError("\n".join(errors))
+    def serve_forever(self):
+        """Answer API requests until interrupted, then stop"""
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            log("\n⏹️  Daemon interrupted")
+        finally:
+            self.stop()
 
-    return True
+    def stop(self):
+        """Stop taking requests and let the sessions finish their running jobs"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.socket_path:
+            Path(self.socket_path).unlink(missing_ok=True)
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
 
+    def session(self, number):
+        """Session thread: keep a warm scraper and run queued jobs on it"""
+        name = f"Session {number}"
+        scraper = worker_scraper(self.chromedriver_path, **self.scraper_options)
+        try:
+            if scraper.setup_driver():
+                with self.changed:
+                    self.warm += 1
+            while True:
+                job = self.queue.get()
+                if job is None:
+                    break
+                scraper.on_page = lambda reviews, job=job: self.publish(job, reviews)
+                self.update(job, status='running', started=datetime.now().isoformat(timespec='seconds'))
 
-def save_reviews(reviews, company, source, output_dir="output"):
-    """Save reviews to JSON file"""
-    if not reviews:
-        print("⚠️  No reviews to save")
-        return None
+                if scraper.needs_browser(job['source']) and not scraper.driver and not scraper.setup_driver():
+                    result, error = None, "Failed to setup WebDriver"
+                else:
+                    log(f"👷 {name}: {job['company']} on {job['source']} (attempt {job['attempt'] + 1})",
+                        session=number, job=job['id'], company=job['company'], source=job['source'])
+                    try:
+                        result, error = run_job(scraper, job, self.output_dir, self.output_format, self.metrics_dir)
+                    except Exception as e:
+                        result, error = None, str(e)
+                scraper.on_page = None
+                self.finish(job, result, error)
 
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
+                # Recycle the browser before it gets slow or bloated, and warm up its successor
+                if (not error and recycle_browser(scraper, name, self.recycle_pages, self.recycle_memory_mb)) \
+                        or not scraper.driver:
+                    scraper.setup_driver()
+        finally:
+            close_worker_scraper(scraper)
 
-    # Clean company name for filename
-    safe_company = re.sub(r'[^\w\s-]', '', company).strip().replace(' ', '_')
-    filename = f"{safe_company}_{source}_reviews_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    filepath = os.path.join(output_dir, filename)
+    def submit(self, request):
+        """Queue a job from {company, source, start, end}; returns its status"""
+        if not isinstance(request, dict):
+            raise ValueError("Expected a JSON object with company, source, start and end")
+        company = str(request.get('company') or '')
+        source = str(request.get('source') or '').lower()
+        start, end = str(request.get('start') or ''), str(request.get('end') or '')
+        validate_inputs(company, start, end)
+        if source not in SCRAPED_SOURCES:
+            raise ValueError(f"source must be one of: {', '.join(SCRAPED_SOURCES)}")
 
-    # Sort reviews by date (newest first)
-    if reviews:
-        reviews.sort(key=lambda x: x.get('parsed_date', ''), reverse=True)
+        with self.changed:
+            job = {'id': str(self.next_id), 'company': company.strip(), 'source': source, 'start': start,
+                   'end': end, 'attempt': 0, 'status': 'queued',
+                   'submitted': datetime.now().isoformat(timespec='seconds'), 'started': None, 'finished': None,
+                   'reviews': 0, 'output': None, 'error': None}
+            self.next_id += 1
+            self.jobs[job['id']] = job
+            self.streams[job['id']] = []
+            self.streamed[job['id']] = set()
+            self.forget_old_jobs()
+        self.queue.put(job)
+        log(f"📥 Job {job['id']}: {job['company']} on {source}", job=job['id'])
+        return dict(job)
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(reviews, f, indent=2, ensure_ascii=False)
+    def update(self, job, **fields):
+        with self.changed:
+            job.update(fields)
+            self.changed.notify_all()
 
-    print(f"💾 Reviews saved to: {filepath}")
-    return filepath
+    def publish(self, job, reviews):
+        """Make a scraped page of a job's reviews available to its streams"""
+        with self.changed:
+            stream, streamed = self.streams.get(job['id']), self.streamed.get(job['id'])
+            if stream is None:
+                return
+            for review in reviews:
+                fingerprint = review_fingerprint(review)
+                if fingerprint not in streamed:
+                    streamed.add(fingerprint)
+                    stream.append(review_dict(review))
+            job['reviews'] = len(stream)
+            self.changed.notify_all()
+
+    def finish(self, job, result, error):
+        """Record a job's outcome, re-queueing it while it has attempts left"""
+        if error and job['attempt'] + 1 < self.max_attempts:
+            log(f"🔁 Re-queueing job {job['id']}: {error}", job=job['id'])
+            self.update(job, attempt=job['attempt'] + 1, status='queued', error=error)
+            self.queue.put(job)
+            return
+        finished = datetime.now().isoformat(timespec='seconds')
+        if error:
+            log(f"❌ Job {job['id']} failed: {error}", job=job['id'])
+            self.update(job, status='failed', error=error, finished=finished)
+        else:
+            log(f"✅ Job {job['id']}: {result['reviews']} reviews -> {result['output']}", job=job['id'])
+            self.update(job, status='done', error=None, finished=finished, output=str(result['output']),
+                        reviews=max(job['reviews'], result['reviews']))
+
+    def forget_old_jobs(self):
+        """Drop the oldest finished jobs (and their streamed reviews) beyond keep_jobs; call with the lock held"""
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in self.FINISHED]
+        for job_id in finished[:max(0, len(self.jobs) - self.keep_jobs)]:
+            del self.jobs[job_id]
+            del self.streams[job_id]
+            del self.streamed[job_id]
+
+    def status(self, job_id=None):
+        """Status of one job (None if unknown), or of every job kept"""
+        with self.changed:
+            if job_id is None:
+                return [dict(job) for job in self.jobs.values()]
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def health(self):
+        with self.changed:
+            states = [job['status'] for job in self.jobs.values()]
+            return {'sessions': self.sessions, 'warm_sessions': self.warm,
+                    'queued': states.count('queued'), 'running': states.count('running')}
+
+    def follow(self, job_id):
+        """Yield batches of a job's reviews as they arrive, until the job has finished"""
+        sent = 0
+        with self.changed:
+            job, stream = self.jobs.get(job_id), self.streams.get(job_id)
+        if job is None:
+            return
+        while True:
+            with self.changed:
+                self.changed.wait_for(lambda: len(stream) > sent or job['status'] in self.FINISHED, timeout=30)
+                batch = stream[sent:]
+                done = job['status'] in self.FINISHED
+            sent += len(batch)
+            if batch:
+                yield batch
+            elif done:
+                return
 
 
 def main():
     """Main function"""
-    print("=" * 50)
-    print("🚀 SaaS Review Scraper Starting...")
-    print("=" * 50)
-
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Scrape SaaS reviews from G2, Capterra, TrustRadius')
-    parser.add_argument('--company', required=True, help='Company name (e.g., "Slack")')
-    parser.add_argument('--start', required=True, help='Start date (YYYY-MM-DD)')
-    parser.add_argument('--end', required=True, help='End date (YYYY-MM-DD)')
-    parser.add_argument('--source', required=True,
-                        choices=['g2', 'capterra', 'trustradius'],
-                        help='Review source')
+    parser.add_argument('--company', help='Company name (e.g., "Slack")')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD)')
+    parser.add_argument('--source', type=parse_sources,
+                        help='Review source (g2, capterra, trustradius), a comma-separated list, or all')
     parser.add_argument('--chromedriver', default='chromedriver.exe',
                         help='Path to ChromeDriver (default: chromedriver.exe in current directory)')
+    parser.add_argument('--backend', choices=['selenium', 'http'], default='selenium',
+                        help='Fetch backend; sources that cannot be fetched over HTTP always use Selenium')
+    parser.add_argument('--record-dir', help='HTTP backend: save fetched pages here for offline replay')
+    parser.add_argument('--db', default='output/reviews.db',
+                        help='SQLite review store; output files are exported from it (default: output/reviews.db)')
+    parser.add_argument('--no-store', action='store_true',
+                        help='Do not use the review store (no resume, no incremental stop)')
+    parser.add_argument('--full-refresh', action='store_true',
+                        help='Keep paginating past reviews already in the store')
+    parser.add_argument('--index', default='output/review_index.db',
+                        help='Fingerprint index of reviews already seen, for dropping duplicates')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Keep duplicate reviews (without the store, output otherwise holds only new reviews)')
+    parser.add_argument('--search-cache', default='output/search_cache.db',
+                        help='Cache of company -> product page URLs, so repeat runs skip the site search')
+    parser.add_argument('--search-ttl-days', type=int, default=30,
+                        help='Search again after this many days (companies not found: after a day)')
+    parser.add_argument('--no-search-cache', action='store_true', help='Always run the site search')
+    parser.add_argument('--seed-products', metavar='CSV',
+                        help='Pre-load the search cache from a CSV with source,company,product_url columns')
+    parser.add_argument('--page-cache', default='output/page_cache',
+                        help='Directory of the raw page cache (default: output/page_cache)')
+    parser.add_argument('--cache-size-mb', type=int, default=1024,
+                        help='Evict least recently used cached pages beyond this size')
+    parser.add_argument('--no-page-cache', action='store_true', help='Do not cache fetched pages')
+    parser.add_argument('--replay', action='store_true',
+                        help='Re-parse cached pages for --company/--source instead of scraping live')
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default='json',
+                        help='Output format; ndjson, ndjson.gz and parquet are streamed page by page')
+    parser.add_argument('--lean', action='store_true',
+                        help='Headless, eager page loads, and block ads/analytics plus heavy resources')
+    parser.add_argument('--block-types', default='Image,Font,Media',
+                        help='Lean mode: resource types to block (Image, Font, Media, Stylesheet)')
+    parser.add_argument('--capture-xhr', action='store_true',
+                        help='Take reviews from captured review API responses, falling back to HTML parsing')
+    parser.add_argument('--rate', type=float, default=1.0,
+                        help='Starting requests per second per site; adapts to how the site responds')
+    parser.add_argument('--max-rate', type=float, default=8.0, help='Upper bound for the adaptive request rate')
+    parser.add_argument('--no-rate-limit', action='store_true',
+                        help='Do not pace, retry or circuit-break requests')
+    parser.add_argument('--prefetch', type=int, default=1, metavar='N',
+                        help='Selenium: keep N numbered pages loading in parallel tabs (default 1: click through)')
+    parser.add_argument('--scoped', action='store_true',
+                        help='Selenium: take only the review containers out of the browser, not the full page')
+    parser.add_argument('--parser', choices=['auto', 'lxml', 'html.parser'], default='auto',
+                        help='HTML parser: compiled lxml extraction plans, or BeautifulSoup html.parser')
+    parser.add_argument('--benchmark-parse', metavar='DIR',
+                        help='Measure parse throughput of both parsers on saved pages for --source and exit')
+    parser.add_argument('--benchmark-memory', type=int, metavar='N',
+                        help='Compare memory per review of dicts and Review records over N reviews and exit')
+    parser.add_argument('--benchmark', nargs='?', const='output/benchmarks', metavar='RESULTS_DIR',
+                        help='Run the offline benchmark suite, save the result under RESULTS_DIR and exit')
+    parser.add_argument('--benchmark-fixtures', metavar='DIR',
+                        help='Benchmark pages recorded with --record-dir (with --company/--start/--end) '
+                             'instead of generated ones')
+    parser.add_argument('--benchmark-latency', type=int, default=50, metavar='MS',
+                        help='Latency of the benchmark\'s stand-in server per request (default: 50)')
+    parser.add_argument('--benchmark-baseline', metavar='FILE',
+                        help='Earlier benchmark result to compare with (default: the latest in RESULTS_DIR)')
+    parser.add_argument('--query', nargs='?', const='output', metavar='EXPORT_DIR',
+                        help='Aggregate the review exports in EXPORT_DIR (filtered by --start/--end/--source/'
+                             '--company) and exit')
+    parser.add_argument('--group-by', default='source',
+                        help='Query: comma-separated grouping, from source, company, company_size, job_title, '
+                             'month, year, rating (default: source)')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text',
+                        help='Log as plain messages or as JSON lines with structured fields')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Write per-stage timing spans as a Chrome trace-event JSON file (batch: a directory)')
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help='Write stage histograms in Prometheus text format (batch: per job, into --trace)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port during the run')
+    parser.add_argument('--jobs', help='Batch mode: CSV file with company,source,start,end columns')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Batch mode: number of worker processes (default: CPU count)')
+    parser.add_argument('--recycle-pages', type=int, default=200,
+                        help='Batch mode: restart a worker\'s browser after this many pages')
+    parser.add_argument('--recycle-memory-mb', type=int, default=2048,
+                        help='Batch mode: restart a worker\'s browser when chromedriver and Chrome together '
+                             'use more resident memory than this')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='Batch mode: attempts per job before giving up')
+    parser.add_argument('--daemon', metavar='ADDRESS',
+                        help='Keep warm browsers running and take jobs over a local API on a port, host:port, '
+                             'or Unix socket path')
+    parser.add_argument('--sessions', type=int, default=2,
+                        help='Daemon mode: number of browser sessions running jobs side by side')
 
     args = parser.parse_args()
 
+    configure_logging(args.log_format)
+    log("=" * 50)
+    log("🚀 SaaS Review Scraper Starting...")
+    log("=" * 50)
+
+    # Several sources fan out to concurrent workers; a single source runs in this process
+    fan_out = bool(args.source) and len(args.source) > 1
+    if args.source and not fan_out:
+        args.source = args.source[0]
+    query_sources = (args.source if fan_out else [args.source]) if args.source else None
+    if fan_out and (args.benchmark_parse or args.replay or args.jobs or args.daemon):
+        parser.error("--benchmark-parse, --replay, --jobs and --daemon take a single --source")
+
+    if args.benchmark_parse:
+        if not args.source:
+            parser.error("--benchmark-parse requires --source")
+        benchmark_parsers(args.benchmark_parse, args.source)
+        return 0
+
+    if args.benchmark_memory:
+        benchmark_review_memory(args.benchmark_memory)
+        return 0
+
+    if args.query:
+        try:
+            corpus = ReviewColumns.open(args.query)
+            mask = corpus.select(args.start, args.end, query_sources, args.company)
+            rows = corpus.group([name.strip() for name in args.group_by.split(',') if name.strip()], mask)
+        except ImportError:
+            log("❌ --query needs NumPy: pip install numpy")
+            return 1
+        except ValueError as e:
+            log(f"❌ {e}")
+            return 1
+        log(f"🔎 {int(mask.sum())} of {len(corpus)} reviews match")
+        for row in rows:
+            key = ", ".join(f"{name}={row[name]}" for name in row if name not in ('reviews', 'rated', 'mean_rating'))
+            mean = f", mean rating {row['mean_rating']}" if row['mean_rating'] is not None else ""
+            log(f"   {key}: {row['reviews']} reviews{mean}", **row)
+        return 0
+
+    if args.benchmark:
+        try:
+            run_benchmarks(args.benchmark, args.benchmark_fixtures, args.company, to_date(args.start),
+                           to_date(args.end), args.benchmark_latency / 1000, args.benchmark_baseline)
+        except ValueError as e:
+            log(f"❌ {e}")
+            return 1
+        return 0
+
+    search_cache_path = None if args.no_search_cache else args.search_cache
+    if args.seed_products:
+        if not search_cache_path:
+            parser.error("--seed-products cannot be combined with --no-search-cache")
+        cache = SearchCache(search_cache_path, args.search_ttl_days)
+        log(f"📌 Seeded {cache.seed(args.seed_products)} product URLs into {search_cache_path}")
+        cache.close()
+        if not args.jobs and not args.daemon and not args.company:
+            return 0
+
+    if not args.jobs and not args.daemon:
+        missing = [f"--{name}" for name in ('company', 'start', 'end', 'source') if not getattr(args, name)]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+
+    jobs = None
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+        if not jobs:
+            log("❌ No valid jobs found")
+            return 1
+    if args.daemon:
+        sources = set(SCRAPED_SOURCES)
+    else:
+        sources = {job['source'] for job in jobs} if jobs else set(args.source) if fan_out else {args.source}
+
+    # Check ChromeDriver (only needed when some source runs on Selenium)
+    chromedriver_path = args.chromedriver
+    needs_browser = not args.replay and any(args.backend == 'selenium' or 'http' not in SOURCE_BACKENDS[s]
+                                            for s in sources)
+    if needs_browser and not os.path.exists(chromedriver_path):
+        log(f"❌ ChromeDriver not found at: {chromedriver_path}")
+        log("💡 Make sure chromedriver.exe is in the project folder")
+        return 1
+
+    lean_types = [t.strip() for t in args.block_types.split(',') if t.strip()] if args.lean else None
+    rate_limit = False if args.no_rate_limit else {'rate': args.rate, 'max_rate': args.max_rate}
+
+    if args.daemon:
+        daemon = ScraperDaemon(chromedriver_path, args.sessions, output_format=args.format,
+                               max_attempts=args.max_attempts, recycle_pages=args.recycle_pages,
+                               recycle_memory_mb=args.recycle_memory_mb, metrics_dir=args.trace,
+                               backend=args.backend, db_path=None if args.no_store else args.db,
+                               cache_dir=None if args.no_page_cache else args.page_cache,
+                               cache_max_bytes=args.cache_size_mb * 1024 * 1024, lean_types=lean_types,
+                               index_path=None if args.no_dedup else args.index, prefetch=args.prefetch,
+                               rate_limit=rate_limit, search_cache_path=search_cache_path,
+                               search_ttl_days=args.search_ttl_days, scoped=args.scoped,
+                               capture_xhr=args.capture_xhr, parser=args.parser, full_refresh=args.full_refresh,
+                               record_dir=args.record_dir)
+        try:
+            daemon.start(args.daemon)
+        except (OSError, ValueError) as e:
+            log(f"❌ Could not start the daemon: {e}")
+            daemon.stop()
+            return 1
+        daemon.serve_forever()
+        return 0
+
+    if jobs:
+        results = run_batch(jobs, chromedriver_path, args.workers, args.recycle_pages,
+                            args.recycle_memory_mb, args.max_attempts, backend=args.backend,
+                            db_path=None if args.no_store else args.db,
+                            cache_dir=None if args.no_page_cache else args.page_cache,
+                            cache_max_bytes=args.cache_size_mb * 1024 * 1024,
+                            lean_types=lean_types, output_format=args.format,
+                            index_path=None if args.no_dedup else args.index, prefetch=args.prefetch,
+                            rate_limit=rate_limit, search_cache_path=search_cache_path,
+                            search_ttl_days=args.search_ttl_days, log_format=args.log_format,
+                            metrics_dir=args.trace, scoped=args.scoped, capture_xhr=args.capture_xhr,
+                            parser=args.parser, full_refresh=args.full_refresh, record_dir=args.record_dir)
+        return 0 if all(not r['error'] for r in results) else 1
+
     # Validate inputs
     try:
         validate_inputs(args.company, args.start, args.end)
-        print(f"📋 Parameters: Company='{args.company}', Start='{args.start}', End='{args.end}', Source='{args.source}'")
+        log(f"📋 Parameters: Company='{args.company}', Start='{args.start}', End='{args.end}', Source='{','.join(args.source) if fan_out else args.source}'")
     except ValueError as e:
-        print(f"❌ Input validation failed: {e}")
+        log(f"❌ Input validation failed: {e}")
         return 1
 
+    if fan_out:
+        filepath, count, results = scrape_sources(
+            args.company, args.source, args.start, args.end, chromedriver_path, args.format,
+            recycle_pages=args.recycle_pages, recycle_memory_mb=args.recycle_memory_mb,
+            max_attempts=args.max_attempts, backend=args.backend, db_path=None if args.no_store else args.db,
+            cache_dir=None if args.no_page_cache else args.page_cache,
+            cache_max_bytes=args.cache_size_mb * 1024 * 1024, lean_types=lean_types,
+            index_path=None if args.no_dedup else args.index, prefetch=args.prefetch, rate_limit=rate_limit,
+            search_cache_path=search_cache_path, search_ttl_days=args.search_ttl_days,
+            log_format=args.log_format, metrics_dir=args.trace, scoped=args.scoped, capture_xhr=args.capture_xhr,
+            parser=args.parser, full_refresh=args.full_refresh, record_dir=args.record_dir)
+        log("\n📊 SUMMARY:")
+        log(f"   Total Reviews: {count}")
+        log(f"   Date Range: {args.start} to {args.end}")
+        log(f"   Sources: {', '.join(s.upper() for s in args.source)}")
+        log(f"   Company: {args.company}")
+        log(f"   Output: {filepath}")
+        return 0 if all(not r['error'] for r in results) else 1
+
     # Parse dates
-    start_date = datetime.strptime(args.start, '%Y-%m-%d').date()
-    end_date = datetime.strptime(args.end, '%Y-%m-%d').date()
+    start_date, end_date = DATES.window(args.start, args.end)
 
-    # Check ChromeDriver
-    chromedriver_path = args.chromedriver
-    if not os.path.exists(chromedriver_path):
-        print(f"❌ ChromeDriver not found at: {chromedriver_path}")
-        print("💡 Make sure chromedriver.exe is in the project folder")
-        return 1
+    page_cache = None
+    if not args.no_page_cache:
+        page_cache = PageCache(args.page_cache, args.cache_size_mb * 1024 * 1024)
 
-    print(f"🔧 Using ChromeDriver: {chromedriver_path}")
+    if args.replay:
+        if not page_cache:
+            log("❌ --replay needs the page cache")
+            return 1
+        scraper = ReviewScraper(chromedriver_path, parser=args.parser)
+        scraper.page_cache = page_cache
+        try:
+            reviews = scraper.replay_reviews(args.source, args.company, start_date, end_date)
+        except ValueError as e:
+            log(f"❌ {e}")
+            return 1
+        finally:
+            page_cache.close()
+        filepath = save_reviews(reviews, args.company, args.source)
+        log(f"📊 Replayed {len(reviews)} reviews -> {filepath}")
+        return 0
 
     # Initialize scraper
-    scraper = ReviewScraper(chromedriver_path)
+    http_options = {'record_dir': args.record_dir} if args.record_dir else None
+    scraper = ReviewScraper(chromedriver_path, args.backend, http_options, args.parser)
+    scraper.page_cache = page_cache
+    if args.format != 'json':
+        try:
+            scraper.sink = open_sink(args.format, args.company, args.source)
+        except ImportError as e:
+            log(f"❌ {e}")
+            return 1
+    if lean_types is not None:
+        scraper.lean = LeanBrowser(lean_types)
+    if args.capture_xhr:
+        scraper.capture = NetworkCapture()
+    if args.scoped:
+        scraper.scoped = ScopedCapture()
+    scraper.prefetch = args.prefetch
+    scraper.limiter = RateLimiter(**rate_limit) if rate_limit else None
+    if not args.no_store:
+        scraper.store = ReviewStore(args.db)
+        scraper.incremental = not args.full_refresh
+    if not args.no_dedup:
+        scraper.index = ReviewIndex(args.index)
+    if search_cache_path:
+        scraper.search_cache = SearchCache(search_cache_path, args.search_ttl_days)
+    if args.metrics_port:
+        scraper.metrics.serve(args.metrics_port)
+    if scraper.needs_browser(args.source):
+        log(f"🔧 Using ChromeDriver: {chromedriver_path}")
+    else:
+        log(f"🌐 Using HTTP backend for {args.source}")
 
     try:
         # Setup WebDriver
-        if not scraper.setup_driver():
-            print("❌ Failed to setup WebDriver")
+        if scraper.needs_browser(args.source) and not scraper.setup_driver():
+            log("❌ Failed to setup WebDriver")
             return 1
 
         # Scrape reviews
         reviews = scraper.scrape_reviews(args.source, args.company, start_date, end_date)
+        status = 0
+        if scraper.cut_short_by:
+            # What was scraped is still saved, but the run is incomplete
+            status = 1
+            log("💡 Pagination was cut short; run the same command again to resume" if scraper.store
+                else "💡 Pagination was cut short; the output is incomplete")
+
+        if scraper.sink:
+            with scraper.metrics.stage('save'):
+                filepath, count = finish_sink(scraper, args.source, args.company, start_date, end_date)
+            log("\n📊 SUMMARY:")
+            log(f"   Total Reviews: {count}")
+            log(f"   Date Range: {args.start} to {args.end}")
+            log(f"   Source: {args.source.upper()}")
+            log(f"   Company: {args.company}")
+            log(f"   Output: {filepath}")
+            return status
+
+        if scraper.store:
+            # The store is the primary copy; the output file is an export of everything in the window
+            reviews = scraper.store.reviews(args.source, args.company, start_date, end_date)
 
         # Save results
         if reviews:
-            filepath = save_reviews(reviews, args.company, args.source)
+            with scraper.metrics.stage('save'):
+                filepath = save_reviews(reviews, args.company, args.source)
+            scraper.mark_saved()
 
-            print("\n📊 SUMMARY:")
-            print(f"   Total Reviews: {len(reviews)}")
-            print(f"   Date Range: {args.start} to {args.end}")
-            print(f"   Source: {args.source.upper()}")
-            print(f"   Company: {args.company}")
-            print(f"   Output: {filepath}")
+            log("\n📊 SUMMARY:")
+            log(f"   Total Reviews: {len(reviews)}")
+            log(f"   Date Range: {args.start} to {args.end}")
+            log(f"   Source: {args.source.upper()}")
+            log(f"   Company: {args.company}")
+            log(f"   Output: {filepath}")
 
             # Show sample review
             if reviews:
                 sample = reviews[0]
-                print(f"\n📝 Sample Review:")
-                print(f"   Title: {sample['title'][:50]}...")
-                print(f"   Reviewer: {sample['reviewer']}")
-                print(f"   Date: {sample['date']}")
-                print(f"   Rating: {sample['rating']}")
+                log(f"\n📝 Sample Review:")
+                log(f"   Title: {sample['title'][:50]}...")
+                log(f"   Reviewer: {sample['reviewer']}")
+                log(f"   Date: {sample['date']}")
+                log(f"   Rating: {sample['rating']}")
         else:
-            print("⚠️  No reviews found in the specified date range")
-            print("💡 Try widening the date range or check company name spelling")
+            log("⚠️  No reviews found in the specified date range")
+            log("💡 Try widening the date range or check company name spelling")
 
-        return 0
+        return status
 
     except KeyboardInterrupt:
-        print("\n⏹️  Scraping interrupted by user")
+        log("\n⏹️  Scraping interrupted by user")
+        if scraper.store:
+            log("💡 Completed pages are saved; run the same command again to resume")
+        elif scraper.sink:
+            log(f"💡 Pages scraped so far are kept under {scraper.sink.path}.parts")
         return 1
 
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
+        log(f"\n❌ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
         return 1
@@ -573,6 +4622,16 @@ def main():
     finally:
         pass
         scraper.close_driver()
+        if scraper.store:
+            scraper.store.close()
+        if scraper.page_cache:
+            scraper.page_cache.close()
+        if scraper.index:
+            scraper.index.close()
+        if scraper.search_cache:
+            scraper.search_cache.close()
+        scraper.metrics.export(args.trace, args.metrics_file)
+        scraper.metrics.close()
 
 
 if __name__ == "__main__":
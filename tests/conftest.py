@@ -0,0 +1,59 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRAPER_PATH = Path(__file__).resolve().parent.parent / 'scraper[1].py'
+
+
+def load_scraper():
+    """Import scraper[1].py, whose file name is not a valid module name"""
+    if 'scraper' in sys.modules:
+        return sys.modules['scraper']
+    spec = importlib.util.spec_from_file_location('scraper', SCRAPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running it, so pickling and multiprocessing find the module's classes
+    sys.modules['scraper'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def scraper():
+    return load_scraper()
+
+
+@pytest.fixture
+def listing(scraper, tmp_path):
+    """A 12-page G2 listing of 5 reviews per page, written for FixtureServer"""
+    info = scraper.write_benchmark_fixtures(tmp_path / 'fixtures', pages=12, per_page=5)
+    info['directory'] = tmp_path / 'fixtures' / 'g2'
+    return info
+
+
+@pytest.fixture
+def server(scraper, listing):
+    with scraper.FixtureServer(listing['directory']) as srv:
+        yield srv
+
+
+@pytest.fixture
+def make_scraper(scraper, server, tmp_path):
+    """ReviewScraper on the HTTP backend pointed at the fixture server, without rate limiting"""
+    made = []
+
+    def make(store=None, incremental=False):
+        sc = scraper.ReviewScraper(None, 'http', {'origin': server.url})
+        sc.limiter = None
+        sc.incremental = incremental
+        if store:
+            sc.store = scraper.ReviewStore(str(tmp_path / store))
+        made.append(sc)
+        return sc
+
+    yield make
+    for sc in made:
+        if sc.store:
+            sc.store.close()
+        sc.close_driver()
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+
+
+LISTING = 'https://www.g2.com/products/acme/reviews'
+
+
+@pytest.fixture
+def load_page(scraper, server):
+    """load_page(n) for find_first_page: page n's reviews fetched from the fixture server, None past the end"""
+    fetcher = scraper.HTTPFetcher(origin=server.url)
+    parser = scraper.ReviewScraper(None)
+    loaded = []
+
+    def load(page):
+        loaded.append(page)
+        try:
+            html = fetcher.fetch(scraper.page_url(LISTING, page))
+        except scraper.HTTPStatusError:
+            return None
+        return parser.parse_page('g2', html)[0]
+
+    load.loaded = loaded
+    load.page_dates = lambda page: [review.parsed_date for review in load(page)]
+    yield load
+    fetcher.close()
+
+
+def first_page_reaching(load_page, pages, end):
+    """The first page a linear walk would keep a review from"""
+    return next(page for page in range(1, pages + 1) if min(load_page.page_dates(page)) <= end)
+
+
+@pytest.mark.parametrize('page', [1, 2, 5, 8, 12])
+def test_finds_the_first_page_reaching_the_window(scraper, listing, load_page, page):
+    end = load_page.page_dates(page)[2]
+    expected = first_page_reaching(load_page, listing['pages'], end)
+    load_page.loaded.clear()
+    planner = scraper.DateWindowPlanner(listing['start'], end)
+
+    assert planner.find_first_page(load_page) == expected == page
+    assert planner.first_page == page
+    assert planner.probes == len(load_page.loaded) <= 2 * (page.bit_length() + 1)
+    assert planner.pages_skipped == len(set(range(1, page)) - set(load_page.loaded))
+
+
+def test_window_past_the_last_page_lands_past_the_end(scraper, listing, load_page):
+    end = listing['start'] - timedelta(days=30)
+    planner = scraper.DateWindowPlanner(end - timedelta(days=30), end)
+
+    page = planner.find_first_page(load_page)
+
+    assert page == listing['pages'] + 1
+    assert load_page(page) is None
+
+
+def test_should_stop_once_a_page_is_entirely_older(scraper, listing, load_page):
+    start = load_page.page_dates(4)[-1]
+    planner = scraper.DateWindowPlanner(start, listing['end'])
+
+    assert not planner.should_stop(load_page(4), 4)
+    assert planner.should_stop(load_page(5), 5)
+    assert planner.report()['stopped_at'] == 5
@@ -0,0 +1,73 @@
+import pytest
+
+
+LISTING = 'https://www.g2.com/products/acme/reviews'
+
+
+@pytest.fixture
+def fetcher(scraper, server):
+    fetcher = scraper.HTTPFetcher(origin=server.url)
+    yield fetcher
+    fetcher.close()
+
+
+def test_pages_are_gzip_decoded(scraper, fetcher, listing):
+    html = fetcher.fetch(LISTING)
+
+    assert html == (listing['directory'] / scraper.fixture_name(LISTING)).read_text(encoding='utf-8')
+    assert fetcher.stats['bytes_received'] < fetcher.stats['bytes_decoded']
+
+
+def test_connections_are_kept_alive(fetcher):
+    for page in range(1, 6):
+        fetcher.fetch(f"{LISTING}?page={page}" if page > 1 else LISTING)
+
+    assert fetcher.stats['requests'] == 5
+    assert fetcher.stats['connections'] == 1
+
+
+def test_session_cookie_is_kept_for_the_real_host(fetcher):
+    fetcher.fetch(LISTING)
+    fetcher.fetch(f"{LISTING}?page=2")
+
+    cookies = {(cookie.domain, cookie.name, cookie.value) for cookie in fetcher.cookies}
+    assert cookies == {('www.g2.com', 'session', 'fixture')}
+
+
+def test_redirects_are_followed(scraper, listing):
+    redirects = {'/products/acme': '/products/acme/reviews', '/p/acme': '/products/acme'}
+    with scraper.FixtureServer(listing['directory'], redirects=redirects) as srv:
+        fetcher = scraper.HTTPFetcher(origin=srv.url)
+        html = fetcher.fetch('https://www.g2.com/p/acme')
+        fetcher.close()
+
+    assert html == (listing['directory'] / scraper.fixture_name(LISTING)).read_text(encoding='utf-8')
+    assert fetcher.stats['requests'] == 3
+
+
+def test_redirect_loops_are_cut_off(scraper, listing):
+    redirects = {'/a': '/b', '/b': '/a'}
+    with scraper.FixtureServer(listing['directory'], redirects=redirects) as srv:
+        fetcher = scraper.HTTPFetcher(origin=srv.url, max_redirects=3)
+        with pytest.raises(ConnectionError, match='Too many redirects'):
+            fetcher.fetch('https://www.g2.com/a')
+        fetcher.close()
+
+    assert fetcher.stats['requests'] == 4
+
+
+def test_missing_pages_raise_their_status(scraper, fetcher):
+    with pytest.raises(scraper.HTTPStatusError) as raised:
+        fetcher.fetch(f"{LISTING}?page=99")
+
+    assert raised.value.status == 404
+
+
+def test_http_scrape_returns_every_review_in_the_window(make_scraper, listing):
+    sc = make_scraper()
+
+    reviews = sc.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+
+    assert sc.last_error is None
+    assert len(reviews) == listing['reviews']
+    assert [review.title for review in reviews[:2]] == ['Title 0', 'Title 1']
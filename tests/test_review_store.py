@@ -0,0 +1,55 @@
+def count(store, table):
+    return store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def checkpoint(store):
+    return store.conn.execute("SELECT MAX(page) FROM checkpoints").fetchone()[0]
+
+
+def test_interrupted_run_keeps_its_checkpoint_and_resumes(scraper, make_scraper, listing):
+    page3 = listing['directory'] / scraper.fixture_name('/products/acme/reviews?page=3')
+    html = page3.read_text(encoding='utf-8')
+    page3.unlink()
+
+    first = make_scraper(store='reviews.db')
+    first.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+
+    assert isinstance(first.last_error, ConnectionError)
+    assert count(first.store, 'reviews') == 10
+    assert checkpoint(first.store) == 2
+    assert count(first.store, 'runs') == 0
+
+    page3.write_text(html, encoding='utf-8')
+    second = make_scraper(store='reviews.db')
+    second.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+
+    assert second.last_error is None
+    assert count(second.store, 'reviews') == listing['reviews']
+    assert count(second.store, 'runs') == 1
+    # The search page, then pages 3..12 only
+    assert second.http.stats['requests'] == 1 + listing['pages'] - 2
+
+
+def test_incremental_run_stops_at_reviews_stored_by_a_complete_run(make_scraper, listing):
+    first = make_scraper(store='reviews.db', incremental=True)
+    first.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+    assert count(first.store, 'runs') == 1
+
+    second = make_scraper(store='reviews.db', incremental=True)
+    reviews = second.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+
+    assert second.last_error is None
+    assert len(reviews) == 5
+    # The search page and the first listing page, which is already covered
+    assert second.http.stats['requests'] == 2
+    assert count(second.store, 'reviews') == listing['reviews']
+
+
+def test_full_refresh_walks_every_page_again(make_scraper, listing):
+    make_scraper(store='reviews.db', incremental=True).scrape_reviews(
+        'g2', listing['company'], listing['start'], listing['end'])
+
+    second = make_scraper(store='reviews.db', incremental=False)
+    second.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+
+    assert second.http.stats['requests'] == 1 + listing['pages']
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+
+def scrape_to_sink(scraper, make_scraper, listing, output_format, output_dir, store=None):
+    """Scrape the listing into a streaming sink; returns (path, review count)"""
+    sc = make_scraper(store=store)
+    sc.sink = scraper.open_sink(output_format, listing['company'], 'g2', str(output_dir))
+    sc.scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+    return scraper.finish_sink(sc, 'g2', listing['company'], listing['start'], listing['end'])
+
+
+@pytest.mark.parametrize('output_format', ['ndjson', 'parquet'])
+def test_sink_round_trips_through_review_columns(scraper, make_scraper, listing, tmp_path, output_format):
+    reviews = make_scraper().scrape_reviews('g2', listing['company'], listing['start'], listing['end'])
+    _, count = scrape_to_sink(scraper, make_scraper, listing, output_format, tmp_path / 'out')
+
+    assert count == len(reviews) == listing['reviews']
+    columns = scraper.ReviewColumns.open(tmp_path / 'out')
+    assert len(columns) == listing['reviews']
+
+    ratings = [review.rating for review in reviews]
+    [row] = columns.group(('source', 'company'))
+    assert row == {'source': 'g2', 'company': listing['company'], 'reviews': len(reviews), 'rated': len(ratings),
+                   'mean_rating': round(sum(ratings) / len(ratings), 3)}
+
+    start, end = reviews[-20].parsed_date, reviews[10].parsed_date
+    in_window = [review for review in reviews if start <= review.parsed_date <= end]
+    assert int(columns.select(start, end, source='g2', company=listing['company']).sum()) == len(in_window)
+    assert int(columns.select(source='trustradius').sum()) == 0
+
+    sizes = {}
+    for review in reviews:
+        sizes[review.company_size] = sizes.get(review.company_size, 0) + 1
+    assert {row['company_size']: row['reviews'] for row in columns.group('company_size')} == sizes
+
+
+def test_columns_are_memory_mapped_until_an_export_changes(scraper, make_scraper, listing, tmp_path):
+    scrape_to_sink(scraper, make_scraper, listing, 'ndjson', tmp_path / 'out')
+    built = scraper.ReviewColumns.open(tmp_path / 'out')
+    cached = scraper.ReviewColumns.open(tmp_path / 'out')
+
+    assert type(cached.columns['date']).__name__ == 'memmap'
+    assert cached.group('year') == built.group('year')
+
+    review = scraper.Review(title='New', description='Body', date=str(listing['end']), parsed_date=listing['end'],
+                            rating=5.0, reviewer='Someone', job_title='', company_size='', source='g2')
+    scraper.save_reviews([review], listing['company'], 'g2', str(tmp_path / 'out'), suffix='_new')
+    assert len(scraper.ReviewColumns.open(tmp_path / 'out')) == listing['reviews'] + 1
+
+
+def test_store_backed_sink_is_filled_from_the_store(scraper, make_scraper, listing, tmp_path):
+    path, count = scrape_to_sink(scraper, make_scraper, listing, 'ndjson', tmp_path / 'out', store='reviews.db')
+
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert count == len(rows) == listing['reviews']
+    assert rows[0]['title'] == 'Title 0'
+    assert [row['date'] for row in rows] == sorted((row['date'] for row in rows), reverse=True)